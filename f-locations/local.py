@@ -0,0 +1,54 @@
+import asyncio
+import contextlib
+import logging
+import time
+
+from src import config
+from src.di import Container
+from src.handle import handle_many
+from src.interfaces import IEventConsumer
+from src.types import IPEvent
+
+
+async def run(consumer: IEventConsumer[IPEvent]) -> None:
+    """
+    Feed events from the consumer to the handler until cancelled.
+    Events are handled a batch at a time, a batch that failed
+    to be handled is not acknowledged, so the consumer delivers it
+    again, after a wait so a failing handler is not retried in a loop.
+    """
+    handled, started = 0, time.monotonic()
+    try:
+        while True:
+            try:
+                events = await consumer.receive()
+            except Exception as e:
+                logging.error(f"Error receiving events from {consumer} - {str(e)}")
+                await asyncio.sleep(config.LOCATIONS_EVENTS_WAIT_SECONDS)
+                continue
+
+            try:
+                await handle_many([event for _, event in events])
+            except Exception as e:
+                logging.error(f"Error handling {len(events)} events - {str(e)}")
+                await asyncio.sleep(config.LOCATIONS_EVENTS_WAIT_SECONDS)
+                continue
+            await consumer.ack([id for id, _ in events])
+            handled += len(events)
+    finally:
+        elapsed = time.monotonic() - started
+        logging.info(
+            f"Handled {handled} events in {elapsed:.2f}s, "
+            f"{handled / elapsed:.2f} events/s"
+        )
+
+
+async def main() -> None:
+    container = Container()
+    await run(container.consumer())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(main())
@@ -1,22 +1,46 @@
 local head = tonumber(redis.call('GET', KEYS[1]) or "0")
+local tail = tonumber(redis.call('GET', KEYS[3]) or "0")
 local max_size = tonumber(ARGV[1])
 local count = tonumber(ARGV[2])
-local result = {}
+local max_age = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local oldest = math.max(tail, head - max_size)
 
--- If empty buffer
-if head == 0 then
-    return result
+-- Values older than max_age are skipped even if nothing evicted them
+-- yet, timestamps are not ordered, so every value is checked by its
+-- timestamp in the index, values without one are expired as well
+local live = false
+if max_age > 0 then
+    live = {}
+    for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[4], now - max_age, '+inf')) do
+        live[tonumber(member)] = true
+    end
 end
 
--- Calculate how many items to fetch (min of requested count, actual items)
-local items_to_fetch = math.min(count, math.min(head, max_size))
-
 -- Get the latest items in reverse order (newest first)
-for i = 0, items_to_fetch - 1 do
-    local pos = (head - i - 1) % max_size
-    local value = redis.call('HGET', KEYS[2], tostring(pos))
-    if value then
-        table.insert(result, value)
+local sequences = {}
+local i = head - 1
+while i >= oldest and #sequences < count do
+    if not live or live[i] then
+        sequences[#sequences + 1] = i
+    end
+    i = i - 1
+end
+
+-- Read values newest first with bulk
+-- HMGET calls (unpack is limited by the Lua stack)
+local result = {}
+for from = 1, #sequences, 1000 do
+    local fields = {}
+    for i = from, math.min(from + 999, #sequences) do
+        fields[#fields + 1] = sequences[i] % max_size
+    end
+
+    local values = redis.call('HMGET', KEYS[2], unpack(fields))
+    for j = 1, #fields do
+        if values[j] then
+            result[#result + 1] = values[j]
+        end
     end
 end
 
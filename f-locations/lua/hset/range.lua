@@ -0,0 +1,42 @@
+local head = tonumber(redis.call('GET', KEYS[1]) or "0")
+local tail = tonumber(redis.call('GET', KEYS[4]) or "0")
+local max_size = tonumber(ARGV[1])
+local max_age = tonumber(ARGV[4])
+local now = tonumber(ARGV[5])
+local oldest = math.max(tail, head - max_size)
+
+-- Values older than max_age are skipped even if nothing evicted them yet
+local min_score = ARGV[2]
+if max_age > 0 and tonumber(min_score) < now - max_age then
+    min_score = now - max_age
+end
+
+-- Sequence numbers of values with timestamps in the range,
+-- values written before the index existed are not there
+local sequences = {}
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], min_score, ARGV[3])) do
+    local sequence = tonumber(member)
+    if sequence >= oldest and sequence < head then
+        sequences[#sequences + 1] = sequence
+    end
+end
+table.sort(sequences)
+
+-- Read values in the order they were written with bulk
+-- HMGET calls (unpack is limited by the Lua stack)
+local result = {}
+for from = 1, #sequences, 1000 do
+    local fields = {}
+    for i = from, math.min(from + 999, #sequences) do
+        fields[#fields + 1] = sequences[i] % max_size
+    end
+
+    local values = redis.call('HMGET', KEYS[2], unpack(fields))
+    for j = 1, #fields do
+        if values[j] then
+            result[#result + 1] = values[j]
+        end
+    end
+end
+
+return result
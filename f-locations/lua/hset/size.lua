@@ -1,3 +1,21 @@
 local head = tonumber(redis.call('GET', KEYS[1]) or "0")
+local tail = tonumber(redis.call('GET', KEYS[2]) or "0")
 local max_size = tonumber(ARGV[1])
-return math.min(head, max_size)
+local max_age = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local oldest = math.max(tail, head - max_size)
+
+if max_age <= 0 then
+    return head - oldest
+end
+
+-- Values older than max_age are not counted even if nothing evicted
+-- them yet, values without a timestamp in the index are expired as well
+local size = 0
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], now - max_age, '+inf')) do
+    local sequence = tonumber(member)
+    if sequence >= oldest and sequence < head then
+        size = size + 1
+    end
+end
+return size
@@ -0,0 +1,48 @@
+local head = tonumber(redis.call('GET', KEYS[1]) or "0")
+local tail = tonumber(redis.call('GET', KEYS[3]) or "0")
+local max_size = tonumber(ARGV[1])
+local max_age = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+
+-- Oldest item is either the tail, if items were evicted
+-- early, or the last one not overwritten yet
+local oldest = math.max(tail, head - max_size)
+
+-- Values older than max_age are skipped even if nothing evicted them
+-- yet, timestamps are not ordered, so every value is checked by its
+-- timestamp in the index, values without one are expired as well
+local live = false
+if max_age > 0 then
+    live = {}
+    for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[4], now - max_age, '+inf')) do
+        live[tonumber(member)] = true
+    end
+end
+
+-- Oldest item is at oldest % max_size whether
+-- or not the buffer has wrapped, so read from there
+local sequences = {}
+for i = oldest, head - 1 do
+    if not live or live[i] then
+        sequences[#sequences + 1] = i
+    end
+end
+
+-- Read values in the order of sequences with bulk
+-- HMGET calls (unpack is limited by the Lua stack)
+local result = {}
+for from = 1, #sequences, 1000 do
+    local fields = {}
+    for i = from, math.min(from + 999, #sequences) do
+        fields[#fields + 1] = sequences[i] % max_size
+    end
+
+    local values = redis.call('HMGET', KEYS[2], unpack(fields))
+    for j = 1, #fields do
+        if values[j] then
+            result[#result + 1] = values[j]
+        end
+    end
+end
+
+return {head, result}
@@ -0,0 +1,38 @@
+local head = tonumber(redis.call('GET', KEYS[1]) or "0")
+local tail = tonumber(redis.call('GET', KEYS[3]) or "0")
+local max_size = tonumber(ARGV[1])
+local cursor = tonumber(ARGV[2])
+local max_age = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+
+-- Cursor is ahead of the head (buffer was cleared) or
+-- items after the cursor were already trimmed or evicted
+if cursor > head or cursor < math.max(tail, head - max_size) then
+    return {head, false}
+end
+
+-- Items written after the cursor (newest to oldest)
+if head == cursor then
+    return {head, {}}
+end
+local values = redis.call('LRANGE', KEYS[2], 0, head - cursor - 1)
+if max_age <= 0 then
+    return {head, values}
+end
+
+-- Values older than max_age are skipped even if nothing evicted them
+-- yet, timestamps are not ordered, so every value is checked by its
+-- timestamp in the index, values without one are expired as well
+local live = {}
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[4], now - max_age, '+inf')) do
+    live[tonumber(member)] = true
+end
+
+-- Value at index i has sequence number head - i
+local result = {}
+for i, value in ipairs(values) do
+    if live[head - i] then
+        result[#result + 1] = value
+    end
+end
+return {head, result}
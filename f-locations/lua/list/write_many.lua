@@ -0,0 +1,76 @@
+local head = tonumber(redis.call('GET', KEYS[1]) or "0")
+local tail = tonumber(redis.call('GET', KEYS[5]) or "0")
+local used = tonumber(redis.call('GET', KEYS[6]) or "0")
+local max_size = tonumber(ARGV[1])
+local max_bytes = tonumber(ARGV[2])
+local max_age = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+
+-- Values are followed by their timestamps
+local count = (#ARGV - 4) / 2
+
+-- Lists written before the tail was tracked
+-- hold the last max_size values at most
+tail = math.max(tail, head - max_size)
+
+-- Remove the oldest value, it is the last one in the list
+local function evict()
+    local value = redis.call('RPOP', KEYS[2])
+    if value then
+        used = used - #value
+    end
+    redis.call('ZREM', KEYS[4], tail)
+    tail = tail + 1
+end
+
+-- Values trimmed within the same batch are never pushed,
+-- only the last max_size of them are, and every value
+-- currently in the list is evicted by them
+local first = math.max(1, count - max_size + 1)
+if first > 1 then
+    while tail < head do
+        evict()
+    end
+    head = head + first - 1
+    tail = head
+end
+
+for j = first, count do
+    while head - tail >= max_size do
+        evict()
+    end
+
+    -- Newest item is the first one in the list, indexed by its
+    -- timestamp, members are sequence numbers of values
+    local value = ARGV[j + 4]
+    redis.call('LPUSH', KEYS[2], value)
+    redis.call('ZADD', KEYS[4], ARGV[count + j + 4], head)
+    used = used + #value
+    head = head + 1
+end
+
+-- Evict the oldest values while they are older than max_age, values
+-- without a timestamp in the index are expired as well, or while the
+-- list is over its byte budget, the newest value stays then
+while head > tail do
+    local over = max_bytes > 0 and used > max_bytes and head - tail > 1
+    local expired = false
+    if max_age > 0 then
+        local timestamp = redis.call('ZSCORE', KEYS[4], tail)
+        expired = not timestamp or tonumber(timestamp) < now - max_age
+    end
+    if not (over or expired) then
+        break
+    end
+    evict()
+end
+
+-- Values written before sizes were tracked are not counted
+redis.call('SET', KEYS[5], tail)
+redis.call('SET', KEYS[6], math.max(used, 0))
+redis.call('SET', KEYS[1], head)
+
+-- Notify subscribers about the new head once per batch
+redis.call('PUBLISH', KEYS[3], head)
+
+return head
@@ -0,0 +1,24 @@
+-- Head, sequence number of the oldest value still in the buffer
+-- and sequence numbers of values not older than max_age, false
+-- if values do not expire
+local head = tonumber(redis.call('GET', KEYS[1]) or "0")
+local tail = tonumber(redis.call('GET', KEYS[2]) or "0")
+local max_size = tonumber(ARGV[1])
+local max_age = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local oldest = math.max(tail, head - max_size)
+
+if max_age <= 0 then
+    return {head, oldest, false}
+end
+
+-- Timestamps are not ordered, so every value is checked by its
+-- timestamp in the index, values without one are expired as well
+local live = {}
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], now - max_age, '+inf')) do
+    local sequence = tonumber(member)
+    if sequence >= oldest and sequence < head then
+        live[#live + 1] = sequence
+    end
+end
+return {head, oldest, live}
@@ -0,0 +1,20 @@
+-- Move items from the hash layout (KEYS[3]) to the stream (KEYS[2])
+-- if the stream is not there yet, keeping their versions as entry ids
+if redis.call('EXISTS', KEYS[2]) == 1 or redis.call('EXISTS', KEYS[3]) == 0 then
+    return 0
+end
+
+local head = tonumber(redis.call('GET', KEYS[1]) or "0")
+local max_size = tonumber(ARGV[1])
+local size = math.min(head, max_size)
+
+-- Item at position i % max_size was written when head moved from i to i + 1
+for i = head - size, head - 1 do
+    local value = redis.call('HGET', KEYS[3], tostring(i % max_size))
+    if value then
+        redis.call('XADD', KEYS[2], (i + 1) .. '-0', 'value', value)
+    end
+end
+
+redis.call('DEL', KEYS[3])
+return size
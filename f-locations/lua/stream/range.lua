@@ -0,0 +1,51 @@
+local head = tonumber(redis.call('GET', KEYS[1]) or "0")
+local tail = tonumber(redis.call('GET', KEYS[4]) or "0")
+local max_size = tonumber(ARGV[1])
+local max_age = tonumber(ARGV[4])
+local now = tonumber(ARGV[5])
+local oldest = math.max(tail, head - max_size)
+
+-- Values older than max_age are skipped even if nothing evicted them yet
+local min_score = ARGV[2]
+if max_age > 0 and tonumber(min_score) < now - max_age then
+    min_score = now - max_age
+end
+
+-- Sequence numbers of values with timestamps in the range,
+-- values written before the index existed are not there
+local sequences = {}
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], min_score, ARGV[3])) do
+    local sequence = tonumber(member)
+    if sequence >= oldest and sequence < head then
+        sequences[#sequences + 1] = sequence
+    end
+end
+if #sequences == 0 then
+    return {}
+end
+table.sort(sequences)
+
+-- Entry ids are sequence numbers plus one, read the
+-- span of the range once and pick values from it
+local values = {}
+local span = redis.call(
+    'XRANGE', KEYS[2], (sequences[1] + 1) .. '-0', (sequences[#sequences] + 1) .. '-0'
+)
+for _, entry in ipairs(span) do
+    local fields = entry[2]
+    for i = 1, #fields, 2 do
+        if fields[i] == 'value' then
+            values[entry[1]] = fields[i + 1]
+        end
+    end
+end
+
+local result = {}
+for _, sequence in ipairs(sequences) do
+    local value = values[(sequence + 1) .. '-0']
+    if value then
+        result[#result + 1] = value
+    end
+end
+
+return result
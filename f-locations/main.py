@@ -1,13 +1,58 @@
+import asyncio
 import json
+import logging
+import time
 from typing import Any, Dict
 
 from src.di import Container
-from src.handle import handle
+from src.handle import handle_many
 from src.types import IPEvent
 
+# container outlives invocations on a warm instance, so redis
+# connection pools, registered scripts and the ipinfo session are reused
+_container: Container | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+async def _prepare() -> bool:
+    """
+    Create the container on first invocation.
+
+    :return: True if the invocation is a cold start, False otherwise
+    :rtype: bool
+    """
+    global _container, _loop
+
+    loop = asyncio.get_running_loop()
+    if _container is not None and _loop is loop:
+        return False
+
+    if _container is None:
+        _container = Container()
+    else:
+        # clients are bound to the loop they were created in,
+        # so they are created again if the runtime changed it
+        try:
+            await _container.redis().aclose()
+        except Exception as e:
+            logging.error(f"Error closing redis of {_container} - {str(e)}")
+        _container.reset_singletons()
+    _loop = loop
+    return True
+
 
 async def handler(event: Dict[str, Any], context: Dict[str, Any]) -> None:
-    _ = Container()
-    for message in event["messages"]:
-        message = json.loads(message["details"]["message"]["body"])
-        await handle(IPEvent(**message))
+    started = time.perf_counter()
+    cold = await _prepare()
+    prepared = time.perf_counter()
+
+    events = [
+        IPEvent(**json.loads(message["details"]["message"]["body"]))
+        for message in event["messages"]
+    ]
+    await handle_many(events)
+
+    logging.info(
+        f"Handled {len(events)} events in {time.perf_counter() - prepared:.3f}s, "
+        f"{'cold' if cold else 'warm'} start took {prepared - started:.3f}s"
+    )
@@ -1,7 +1,12 @@
 import logging
 import os
 
-from validators import validator_int
+from validators import (
+    validator_events_backend,
+    validator_int,
+    validator_ring_buffer_backend,
+    validator_serializer,
+)
 from validators.interfaces import IValidator
 
 
@@ -28,6 +33,12 @@ def load[
     return casted  # type:ignore[return-value]
 
 
+SQS_ACCESS_KEY: str = load("SQS_ACCESS_KEY", "")
+SQS_SECRET_KEY: str = load("SQS_SECRET_KEY", "")
+SQS_REGION_NAME: str = load("SQS_REGION_NAME", "")
+SQS_ENDPOINT_URL: str = load("SQS_ENDPOINT_URL", "")
+SQS_QUEUE_URL: str = load("SQS_QUEUE_URL", "")
+
 REDIS_HOST: str = load("REDIS_HOST", "redis", ensure_not_empty=True)
 REDIS_PORT: int = load(
     "REDIS_PORT",
@@ -60,6 +71,14 @@ IPINFO_TIMEOUT: int = load(
     ensure_not_empty=True,
     validator=validator_int,
 )
+# ips of a batch are resolved concurrently
+IPINFO_CONCURRENCY: int = load(
+    "IPINFO_CONCURRENCY",
+    5,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
 IPINFO_DEFAULT_CITY: str = load("IPINFO_DEFAULT_CITY", "Unknown", ensure_not_empty=True)
 
 LOCATIONS_BUFFER_NAME: str = load(
@@ -74,6 +93,35 @@ LOCATIONS_BUFFER_MAX_SIZE: int = load(
     ensure_not_empty=True,
     validator=validator_int,
 )
+LOCATIONS_BUFFER_BACKEND: str = load(
+    "LOCATIONS_BUFFER_BACKEND",
+    "hash",
+    ensure_not_empty=True,
+    validator=validator_ring_buffer_backend,
+)
+# readers detect the format of every entry, pickle stays the
+# default until every reader is deployed, then json is switched on
+LOCATIONS_BUFFER_SERIALIZER: str = load(
+    "LOCATIONS_BUFFER_SERIALIZER",
+    "pickle",
+    ensure_not_empty=True,
+    validator=validator_serializer,
+)
+# 0 disables the limit
+LOCATIONS_BUFFER_MAX_BYTES: int = load(
+    "LOCATIONS_BUFFER_MAX_BYTES",
+    0,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+LOCATIONS_BUFFER_MAX_AGE_SECONDS: int = load(
+    "LOCATIONS_BUFFER_MAX_AGE_SECONDS",
+    0,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
 LOCATIONS_HASHSET_NAME: str = load(
     "LOCATIONS_HASHSET_NAME",
     "hashset:locations",
@@ -86,3 +134,41 @@ LOCATIONS_SECONDS_CONSIDER_AS_NEW: int = load(
     cast_to=int,
     validator=validator_int,
 )
+
+# events are read by the local runner only,
+# cloud function receives them from the trigger
+LOCATIONS_EVENTS_BACKEND: str = load(
+    "LOCATIONS_EVENTS_BACKEND",
+    "redis",
+    ensure_not_empty=True,
+    validator=validator_events_backend,
+)
+LOCATIONS_EVENTS_STREAM: str = load(
+    "LOCATIONS_EVENTS_STREAM",
+    "events:locations",
+    ensure_not_empty=True,
+)
+LOCATIONS_EVENTS_GROUP: str = load(
+    "LOCATIONS_EVENTS_GROUP",
+    "locations",
+    ensure_not_empty=True,
+)
+LOCATIONS_EVENTS_CONSUMER: str = load(
+    "LOCATIONS_EVENTS_CONSUMER",
+    "local",
+    ensure_not_empty=True,
+)
+LOCATIONS_EVENTS_BATCH_SIZE: int = load(
+    "LOCATIONS_EVENTS_BATCH_SIZE",
+    10,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+LOCATIONS_EVENTS_WAIT_SECONDS: int = load(
+    "LOCATIONS_EVENTS_WAIT_SECONDS",
+    5,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
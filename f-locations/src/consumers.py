@@ -0,0 +1,183 @@
+import asyncio
+import json
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Any, TypeAlias
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+if TYPE_CHECKING:
+    from types_boto3_sqs.service_resource import Queue
+else:
+    Queue: TypeAlias = Any
+
+from src.interfaces import IEventConsumer
+
+# ReceiveMessage and DeleteMessageBatch accept at most 10 messages
+SQS_BATCH_SIZE = 10
+
+
+class SQSConsumer[T](IEventConsumer[T]):
+    def __init__(
+        self,
+        queue: Queue,
+        event: Callable[..., T],
+        batch_size: int,
+        wait_seconds: int,
+    ) -> None:
+        """
+        Receives events from SQS with long polling,
+        boto3 calls run in the default executor, off the event loop.
+
+        Events are acknowledged by deleting their messages,
+        ids are receipt handles of messages.
+
+        :param queue: SQS queue
+        :type queue: Queue
+        :param event: Builds an event from the decoded message body
+        :type event: Callable[..., T]
+        :param batch_size: Maximum number of events received at once
+        :type batch_size: int
+        :param wait_seconds: Seconds to wait for events
+        :type wait_seconds: int
+        """
+        self.__queue = queue
+        self.__event = event
+        self.__batch_size = min(batch_size, SQS_BATCH_SIZE)
+        self.__wait_seconds = wait_seconds
+
+    async def receive(self) -> list[tuple[str, T]]:
+        messages = await asyncio.to_thread(
+            self.__queue.receive_messages,
+            MaxNumberOfMessages=self.__batch_size,
+            WaitTimeSeconds=self.__wait_seconds,
+        )
+        return [
+            (message.receipt_handle, self.__event(**json.loads(message.body)))
+            for message in messages
+        ]
+
+    async def ack(self, ids: Sequence[str]) -> None:
+        for start in range(0, len(ids), SQS_BATCH_SIZE):
+            end = start + SQS_BATCH_SIZE
+            entries = [
+                {"Id": str(i), "ReceiptHandle": id}
+                for i, id in enumerate(ids[start:end])
+            ]
+            await asyncio.to_thread(
+                self.__queue.delete_messages,
+                Entries=entries,  # type:ignore[arg-type]
+            )
+
+
+class RedisStreamConsumer[T](IEventConsumer[T]):
+    def __init__(
+        self,
+        redis: Redis,
+        stream: str,
+        group: str,
+        consumer: str,
+        event: Callable[..., T],
+        batch_size: int,
+        wait_seconds: int,
+    ) -> None:
+        """
+        Receives events from a redis stream as a member of a consumer
+        group, so several consumers share the stream without receiving
+        the same events. The group is created on first receive.
+
+        Events received by the consumer before a restart and never
+        acknowledged are received again first, then new ones are.
+        Events of a batch that is not acknowledged by the next receive
+        are received again the same way, before any new ones.
+
+        :param redis: Redis client
+        :type redis: Redis
+        :param stream: Name of the stream
+        :type stream: str
+        :param group: Name of the consumer group
+        :type group: str
+        :param consumer: Name of the consumer within the group
+        :type consumer: str
+        :param event: Builds an event from the decoded entry body
+        :type event: Callable[..., T]
+        :param batch_size: Maximum number of events received at once
+        :type batch_size: int
+        :param wait_seconds: Seconds to wait for events
+        :type wait_seconds: int
+        """
+        self.__redis = redis
+        self.__stream = stream
+        self.__group = group
+        self.__consumer = consumer
+        self.__event = event
+        self.__batch_size = batch_size
+        self.__wait_seconds = wait_seconds
+        self.__created = False
+        # id of the last pending entry received, None once
+        # all of them are received and only new ones are read
+        self.__pending: str | None = "0"
+        # ids received and not acknowledged yet
+        self.__unacked: set[str] = set()
+
+    async def __create_group(self) -> None:
+        try:
+            await self.__redis.xgroup_create(
+                self.__stream,
+                self.__group,
+                id="0",
+                mkstream=True,
+            )
+        except ResponseError as e:
+            # group is created by another consumer
+            if "BUSYGROUP" not in str(e):
+                raise
+        self.__created = True
+
+    async def __read(self, id: str, block: int | None) -> list[Any]:
+        response = await self.__redis.xreadgroup(
+            self.__group,
+            self.__consumer,
+            {self.__stream: id},
+            count=self.__batch_size,
+            block=block,
+        )
+        return response[0][1] if response else []
+
+    async def receive(self) -> list[tuple[str, T]]:
+        if not self.__created:
+            await self.__create_group()
+
+        if self.__unacked:
+            # the last batch failed, pending entries are read again
+            self.__unacked.clear()
+            self.__pending = "0"
+
+        entries = []
+        if self.__pending is not None:
+            entries = await self.__read(self.__pending, None)
+            self.__pending = _decode(entries[-1][0]) if entries else None
+        if self.__pending is None:
+            entries = await self.__read(">", self.__wait_seconds * 1000)
+
+        events, trimmed = [], []
+        for id, fields in entries:
+            # pending entries trimmed from the stream have no fields
+            if not fields:
+                trimmed.append(_decode(id))
+                continue
+            body = json.loads(fields[b"body"])
+            events.append((_decode(id), self.__event(**body)))
+
+        await self.ack(trimmed)
+        self.__unacked.update(id for id, _ in events)
+        return events
+
+    async def ack(self, ids: Sequence[str]) -> None:
+        if ids:
+            await self.__redis.xack(self.__stream, self.__group, *ids)
+            self.__unacked.difference_update(ids)
+
+
+def _decode(value: bytes | str) -> str:
+    return value.decode() if isinstance(value, bytes) else value
@@ -1,70 +1,17 @@
 # fmt: off
-import logging
-from copy import deepcopy
 from typing import Any
 
+import boto3
 import ipinfo
 from dependency_injector import containers, providers
 from redis.asyncio import Redis, StrictRedis
 
 from src import config
-from src.redis import RedisRingBuffer
-
-
-def _validate_provider[T: providers.Provider](  # type:ignore[type-arg]
-    provider: T,
-    *,
-    panic: bool = False,
-    fallback_to: T | None = None,
-) -> T:
-    ok, error = True, None
-    copy = deepcopy(provider)
-    try:
-        copy()
-    except Exception as e:
-        logging.error(f"Error providing {provider} - {str(e)}")
-        ok, error = False, e
-
-    if not ok and panic and error:
-        raise error
-    return (fallback_to or provider) if not ok else provider
-
-
-class RedisFallback:
-    def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
-        self.__pipeline = []  # type:ignore[var-annotated]
-
-    async def get(self, *args, **kwargs):  # type:ignore[no-untyped-def]
-        self.__pipeline.append(None)
-        return None
-
-    async def set(self, *args, **kwargs):  # type:ignore[no-untyped-def]
-        return None
-
-    async def hgetall(self, *args, **kwargs):  # type:ignore[no-untyped-def]
-        return {}
-
-    async def hset(self, *args, **kwargs):  # type:ignore[no-untyped-def]
-        return 0
-
-    async def exists(self, *args, **kwargs):  # type:ignore[no-untyped-def]
-        return False
-
-    def register_script(self, *args, **kwargs):  # type:ignore[no-untyped-def]
-        return
-
-    def pipeline(self, *args, **kwargs):  # type:ignore[no-untyped-def]
-        return RedisFallback()
-
-    async def incrby(self, *args, **kwargs):  # type:ignore[no-untyped-def]
-        self.__pipeline.append(None)
-
-    incr = incrby
-
-    async def execute(self, *args, **kwargs):  # type:ignore[no-untyped-def]
-        result = self.__pipeline
-        self.__pipeline.clear()
-        return result
+from src.consumers import RedisStreamConsumer, SQSConsumer
+from src.interfaces import IEventConsumer, IRingBuffer
+from src.redis import RedisListRingBuffer, RedisRingBuffer, RedisStreamRingBuffer
+from src.serializers import JSONSerializer, MsgpackSerializer, PickleSerializer
+from src.types import IPEvent, get_location_timestamp
 
 
 class Container(containers.DeclarativeContainer):
@@ -78,21 +25,86 @@ class Container(containers.DeclarativeContainer):
         socket_timeout=config.REDIS_SOCKET_TIMEOUT,
         socket_connect_timeout=config.REDIS_SOCKET_CONNECTION_TIMEOUT,
     )
-    redis = _validate_provider(
-        redis,
-        fallback_to=providers.Singleton(RedisFallback),  # type:ignore[arg-type]
-    )
 
-    ring_buffer: providers.Singleton[RedisRingBuffer[dict[str, Any]]] = (
-        providers.Singleton(
+    serializer = providers.Selector(
+        providers.Object(config.LOCATIONS_BUFFER_SERIALIZER),
+        pickle=providers.Singleton(PickleSerializer),
+        json=providers.Singleton(JSONSerializer),
+        msgpack=providers.Singleton(MsgpackSerializer),
+    )
+    ring_buffer: providers.Selector[IRingBuffer[dict[str, Any]]] = providers.Selector(
+        providers.Object(config.LOCATIONS_BUFFER_BACKEND),
+        hash=providers.Singleton(
             RedisRingBuffer,
             redis=redis,
             name=config.LOCATIONS_BUFFER_NAME,
             max_size=config.LOCATIONS_BUFFER_MAX_SIZE,
-        )
+            timestamp=get_location_timestamp,
+            max_bytes=config.LOCATIONS_BUFFER_MAX_BYTES,
+            max_age=config.LOCATIONS_BUFFER_MAX_AGE_SECONDS,
+            serializer=serializer,
+        ),
+        list=providers.Singleton(
+            RedisListRingBuffer,
+            redis=redis,
+            name=config.LOCATIONS_BUFFER_NAME,
+            max_size=config.LOCATIONS_BUFFER_MAX_SIZE,
+            timestamp=get_location_timestamp,
+            max_bytes=config.LOCATIONS_BUFFER_MAX_BYTES,
+            max_age=config.LOCATIONS_BUFFER_MAX_AGE_SECONDS,
+            serializer=serializer,
+        ),
+        stream=providers.Singleton(
+            RedisStreamRingBuffer,
+            redis=redis,
+            name=config.LOCATIONS_BUFFER_NAME,
+            max_size=config.LOCATIONS_BUFFER_MAX_SIZE,
+            timestamp=get_location_timestamp,
+            max_bytes=config.LOCATIONS_BUFFER_MAX_BYTES,
+            max_age=config.LOCATIONS_BUFFER_MAX_AGE_SECONDS,
+            serializer=serializer,
+        ),
     )
 
     ipinfo_handler: providers.Singleton = providers.Singleton(  # type:ignore[type-arg]
         ipinfo.getHandlerAsync,
         config.IPINFO_ACCESS_TOKEN,
     )
+
+    # providers below are used by the local runner only
+    _sqs_session = providers.Resource(
+        boto3.session.Session,
+        aws_access_key_id=config.SQS_ACCESS_KEY,
+        aws_secret_access_key=config.SQS_SECRET_KEY,
+    )
+    _sqs_resource = providers.Resource(
+        _sqs_session.provided.resource.call(),
+        service_name="sqs",
+        endpoint_url=config.SQS_ENDPOINT_URL,
+        region_name=config.SQS_REGION_NAME,
+    )
+    sqs_queue = providers.Resource(
+        _sqs_resource.provided.Queue.call(),
+        config.SQS_QUEUE_URL,
+    )
+
+    consumer: providers.Selector[IEventConsumer[IPEvent]] = providers.Selector(
+        providers.Object(config.LOCATIONS_EVENTS_BACKEND),
+        sqs=providers.Singleton(
+            SQSConsumer,
+            queue=sqs_queue,
+            event=IPEvent,
+            batch_size=config.LOCATIONS_EVENTS_BATCH_SIZE,
+            wait_seconds=config.LOCATIONS_EVENTS_WAIT_SECONDS,
+        ),
+        redis=providers.Singleton(
+            RedisStreamConsumer,
+            redis=redis,
+            stream=config.LOCATIONS_EVENTS_STREAM,
+            group=config.LOCATIONS_EVENTS_GROUP,
+            consumer=config.LOCATIONS_EVENTS_CONSUMER,
+            event=IPEvent,
+            batch_size=config.LOCATIONS_EVENTS_BATCH_SIZE,
+            wait_seconds=config.LOCATIONS_EVENTS_WAIT_SECONDS,
+        ),
+    )
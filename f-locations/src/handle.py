@@ -1,5 +1,6 @@
+import asyncio
+from collections.abc import Sequence
 from dataclasses import asdict
-from datetime import datetime
 from typing import Any
 
 from dependency_injector.wiring import Provide, inject
@@ -12,50 +13,85 @@ from src.interfaces import IRingBuffer
 from src.types import IPEvent, Location
 
 
+async def _resolve(
+    ips: Sequence[str],
+    ipinfo_handler: AsyncHandler,
+) -> dict[str, str]:
+    semaphore = asyncio.Semaphore(config.IPINFO_CONCURRENCY)
+
+    async def resolve(ip: str) -> str:
+        async with semaphore:
+            details = await ipinfo_handler.getDetails(
+                ip,
+                timeout=config.IPINFO_TIMEOUT,
+            )
+        return str(getattr(details, "city", config.IPINFO_DEFAULT_CITY))
+
+    locations = await asyncio.gather(*(resolve(ip) for ip in ips))
+    return dict(zip(ips, locations))
+
+
 @inject
-async def handle(
-    event: IPEvent,
+async def handle_many(
+    events: Sequence[IPEvent],
     redis: Redis = Provide[Container.redis],
     ring_buffer: IRingBuffer[dict[str, Any]] = Provide[Container.ring_buffer],
     ipinfo_handler: AsyncHandler = Provide[Container.ipinfo_handler],
 ) -> None:
-    _location: str | bytes | None = await redis.hget(  # type:ignore[misc]
+    if not events:
+        return
+
+    # every ip of the batch is looked up once
+    ips = list(dict.fromkeys(event.ip for event in events))
+    cached: list[str | bytes | None] = await redis.hmget(  # type:ignore[misc]
         config.LOCATIONS_HASHSET_NAME,
-        event.ip,
+        ips,
     )
-    if _location is None:
-        details = await ipinfo_handler.getDetails(
-            event.ip,
-            timeout=config.IPINFO_TIMEOUT,
-        )
-        location = str(getattr(details, "city", config.IPINFO_DEFAULT_CITY))
+    locations = {
+        ip: location.decode() if isinstance(location, bytes) else location
+        for ip, location in zip(ips, cached)
+        if location is not None
+    }
+    unknown = [ip for ip in ips if ip not in locations]
+    if unknown:
+        resolved = await _resolve(unknown, ipinfo_handler)
         await redis.hset(
             config.LOCATIONS_HASHSET_NAME,
-            event.ip,
-            location,
+            mapping=resolved,
         )  # type:ignore[misc]
-    else:
-        location = _location.decode() if isinstance(_location, bytes) else _location
-
-    locations = await ring_buffer.all()
-    put_needed = True
-    if _location is not None:
-        for loc in locations:
-            if loc["location"] != location:
-                continue
-
-            if (
-                datetime.fromtimestamp(float(event.timestamp))
-                - datetime.fromtimestamp(float(loc["timestamp"]))
-            ).seconds < config.LOCATIONS_SECONDS_CONSIDER_AS_NEW:
-                put_needed = False
-
-    if put_needed:
-        await ring_buffer.put(
-            asdict(
-                Location(
-                    location=location,
-                    timestamp=event.timestamp,
+        locations.update(resolved)
+
+    # location is not new if it was seen recently, items within
+    # the windows of all events are read once and items put by
+    # earlier events of the batch are seen by later ones
+    timestamps = [float(event.timestamp) for event in events]
+    recent = [
+        (loc["location"], float(loc["timestamp"]))
+        for loc in await ring_buffer.range(
+            min(timestamps) - config.LOCATIONS_SECONDS_CONSIDER_AS_NEW,
+            max(timestamps),
+        )
+    ]
+
+    seen = set(ips) - set(unknown)
+    new: list[dict[str, Any]] = []
+    for event, timestamp in zip(events, timestamps):
+        location = locations[event.ip]
+        start = timestamp - config.LOCATIONS_SECONDS_CONSIDER_AS_NEW
+        put_needed = event.ip not in seen or not any(
+            loc == location and start <= ts <= timestamp for loc, ts in recent
+        )
+        seen.add(event.ip)
+
+        if put_needed:
+            new.append(
+                asdict(
+                    Location(
+                        location=location,
+                        timestamp=event.timestamp,
+                    )
                 )
             )
-        )
+            recent.append((location, timestamp))
+
+    await ring_buffer.put_many(new)
@@ -1,15 +1,35 @@
+from collections.abc import AsyncIterator, Sequence
 from typing import Protocol
 
 
 class IRingBuffer[T](Protocol):
-    async def put(self, value: T) -> bool:
+    async def initialize(self) -> None:
+        """
+        Prepare the buffer for use, e.g. on application startup.
+        Other methods initialize the buffer on their own if needed.
+        """
+        ...
+
+    async def put(self, value: T) -> int:
         """
         Put a value to the ring buffer.
 
         :param value: Value to put
         :type value: T
-        :return: True if successfull, False otherwise
-        :rtype: bool
+        :return: Version of the buffer after the write
+        :rtype: int
+        """
+        ...
+
+    async def put_many(self, values: Sequence[T]) -> int:
+        """
+        Put several values to the ring buffer at once,
+        in the order they are given.
+
+        :param values: Values to put
+        :type values: Sequence[T]
+        :return: Version of the buffer after the write
+        :rtype: int
         """
         ...
 
@@ -23,6 +43,16 @@ class IRingBuffer[T](Protocol):
         """
         ...
 
+    async def snapshot(self) -> tuple[int, list[T]]:
+        """
+        Read the current version and all items from the buffer at once.
+        Returns items in the order they were written.
+
+        :return: Version and values in the buffer
+        :rtype: tuple[int, list[T]]
+        """
+        ...
+
     async def latest(self, n: int = 1) -> list[T]:
         """
         Read the n most recent items from the buffer.
@@ -35,6 +65,54 @@ class IRingBuffer[T](Protocol):
         """
         ...
 
+    async def since(self, cursor: int) -> tuple[int, list[T]] | None:
+        """
+        Read items written after the cursor.
+        Returns items in the order they were written.
+
+        :param cursor: Version of the buffer the caller has already seen
+        :type cursor: int
+        :return: Current version and items written after the cursor,
+            None if some of them were already evicted
+        :rtype: tuple[int, list[T]] | None
+        """
+        ...
+
+    async def range(self, start_ts: float, end_ts: float) -> list[T]:
+        """
+        Read items with timestamps in the range, both ends included.
+        Returns items in the order they were written.
+
+        :param start_ts: Unix timestamp to read items from
+        :type start_ts: float
+        :param end_ts: Unix timestamp to read items until
+        :type end_ts: float
+        :return: Values in the buffer within the range
+        :rtype: list[T]
+        """
+        ...
+
+    async def version(self) -> int:
+        """
+        Get the current version of the buffer.
+        Version grows with every put and is reset by clear.
+
+        :return: Current version
+        :rtype: int
+        """
+        ...
+
+    def subscribe(self) -> AsyncIterator[int]:
+        """
+        Subscribe to changes of the buffer.
+        Yields the current version once subscribed
+        and then a new version on every put or clear.
+
+        :return: Versions of the buffer
+        :rtype: AsyncIterator[int]
+        """
+        ...
+
     async def clear(self) -> bool:
         """
         Clear the buffer.
@@ -53,6 +131,16 @@ class IRingBuffer[T](Protocol):
         """
         ...
 
+    async def stats(self) -> dict[str, int]:
+        """
+        Get usage of the buffer: current version,
+        number of elements and bytes they take.
+
+        :return: Mapping with "version", "size" and "bytes" keys
+        :rtype: dict[str, int]
+        """
+        ...
+
 
 class ISerializer[T](Protocol):
     def dumps(self, obj: T) -> bytes | str:
@@ -76,3 +164,24 @@ class ISerializer[T](Protocol):
         :rtype: T
         """
         ...
+
+
+class IEventConsumer[T](Protocol):
+    async def receive(self) -> list[tuple[str, T]]:
+        """
+        Receive a batch of events, waiting for them if there are none.
+
+        :return: Events with ids to acknowledge them by
+        :rtype: list[tuple[str, T]]
+        """
+        ...
+
+    async def ack(self, ids: Sequence[str]) -> None:
+        """
+        Acknowledge handled events, so they are not received again.
+        Events that are not acknowledged are received again later.
+
+        :param ids: Ids of handled events
+        :type ids: Sequence[str]
+        """
+        ...
@@ -0,0 +1,62 @@
+import pickle
+from typing import Any
+
+import msgpack  # type:ignore[import-untyped]
+import orjson
+
+from src.interfaces import ISerializer
+
+# first byte of every entry tells its format, pickle
+# protocols 2+ always start with the PROTO opcode, so
+# entries written before tagging are recognized as well
+PICKLE_TAG = b"\x80"
+JSON_TAG = b"\x01"
+MSGPACK_TAG = b"\x02"
+
+
+def json_dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj)
+
+
+def json_loads(data: bytes) -> Any:
+    return orjson.loads(data)
+
+
+class TaggedSerializer[T](ISerializer[T]):
+    """
+    Base for serializers sharing the one-byte format tag.
+    Loading detects the format of every entry, so buffers keep
+    reading entries written before the serializer was switched.
+    """
+
+    def loads(self, obj: bytes | str) -> T:
+        data = obj.encode() if isinstance(obj, str) else obj
+        tag, payload = data[:1], data[1:]
+        if tag == JSON_TAG:
+            return json_loads(payload)  # type:ignore[no-any-return]
+        if tag == MSGPACK_TAG:
+            return msgpack.unpackb(payload)  # type:ignore[no-any-return]
+        if tag == PICKLE_TAG:
+            return pickle.loads(data)  # type:ignore[no-any-return]
+        raise ValueError(f"Unknown serialization format tag {tag!r}")
+
+
+class PickleSerializer[T](TaggedSerializer[T]):
+    def dumps(self, obj: T) -> bytes:
+        return pickle.dumps(obj)
+
+
+class JSONSerializer[T](TaggedSerializer[T]):
+    """
+    JSON entries, encoded with orjson.
+    Entries are readable outside of Python, Lua scripts
+    can decode them with cjson after skipping the tag.
+    """
+
+    def dumps(self, obj: T) -> bytes:
+        return JSON_TAG + json_dumps(obj)
+
+
+class MsgpackSerializer[T](TaggedSerializer[T]):
+    def dumps(self, obj: T) -> bytes:
+        return MSGPACK_TAG + bytes(msgpack.packb(obj))
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Any
 
 
 @dataclass
@@ -11,3 +12,7 @@ class IPEvent:
 class Location:
     location: str
     timestamp: str
+
+
+def get_location_timestamp(location: dict[str, Any]) -> float:
+    return float(location["timestamp"])
@@ -1,6 +1,14 @@
 from validators.file import TemplateValidator
 from validators.int import IntBooleanValidator, IntValidator
-from validators.regex import URL_PATH_PATTERN, URL_PATTERN, RegexValidator
+from validators.regex import (
+    APP_RING_BUFFER_BACKEND_PATTERN,
+    EVENTS_BACKEND_PATTERN,
+    RING_BUFFER_BACKEND_PATTERN,
+    SERIALIZER_PATTERN,
+    URL_PATH_PATTERN,
+    URL_PATTERN,
+    RegexValidator,
+)
 from validators.timezone import TimezoneValidator
 
 __all__ = [
@@ -10,6 +18,10 @@ __all__ = [
     "validator_url_path",
     "validator_timezone",
     "validator_template",
+    "validator_ring_buffer_backend",
+    "validator_app_ring_buffer_backend",
+    "validator_serializer",
+    "validator_events_backend",
 ]
 
 validator_int = IntValidator()
@@ -18,3 +30,7 @@ validator_url = RegexValidator(URL_PATTERN)
 validator_url_path = RegexValidator(URL_PATH_PATTERN)
 validator_timezone = TimezoneValidator()
 validator_template = TemplateValidator()
+validator_ring_buffer_backend = RegexValidator(RING_BUFFER_BACKEND_PATTERN)
+validator_app_ring_buffer_backend = RegexValidator(APP_RING_BUFFER_BACKEND_PATTERN)
+validator_serializer = RegexValidator(SERIALIZER_PATTERN)
+validator_events_backend = RegexValidator(EVENTS_BACKEND_PATTERN)
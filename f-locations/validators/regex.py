@@ -7,6 +7,11 @@ URL_PATTERN = re.compile(
     r"^https?:\/\/(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&//=]*)$"  # noqa:E501
 )
 URL_PATH_PATTERN = re.compile(r"^[A-Za-z0-9/]+$")
+RING_BUFFER_BACKEND_PATTERN = re.compile(r"^(hash|list|stream)$")
+# the web app can keep its buffers in process memory as well
+APP_RING_BUFFER_BACKEND_PATTERN = re.compile(r"^(hash|list|stream|memory)$")
+SERIALIZER_PATTERN = re.compile(r"^(pickle|json|msgpack)$")
+EVENTS_BACKEND_PATTERN = re.compile(r"^(sqs|redis)$")
 
 
 class RegexValidator(IValidator):
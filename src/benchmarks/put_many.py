@@ -0,0 +1,69 @@
+"""
+Time batched puts against sequential ones for every ring buffer backend.
+
+Requires a running Redis, configured the same way as the app.
+Run from src: python -m benchmarks.put_many
+"""
+
+import argparse
+import asyncio
+import time
+
+from redis.asyncio import StrictRedis
+
+from benchmarks.ring_buffer import BACKENDS, PREFIX
+from config import settings
+from services.interfaces import IRingBuffer
+
+BATCHES = (1, 10, 100, 1000)
+
+
+async def main(backends: list[str], batches: list[int], max_size: int) -> None:
+    redis = StrictRedis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        password=settings.REDIS_PASSWORD,
+    )
+    try:
+        print(f"{'backend':>10}{'batch':>8}{'sequential':>15}{'put_many':>15}")
+        for backend in backends:
+            buffer: IRingBuffer[dict[str, int]] = BACKENDS[backend](
+                redis, f"{PREFIX}:{backend}:put_many", max_size
+            )
+            await buffer.clear()  # initializes the buffer as well
+
+            for batch in batches:
+                values = [{"id": i} for i in range(batch)]
+
+                started = time.perf_counter()
+                for value in values:
+                    await buffer.put(value)
+                sequential = time.perf_counter() - started
+
+                started = time.perf_counter()
+                await buffer.put_many(values)
+                batched = time.perf_counter() - started
+
+                print(
+                    f"{backend:>10}{batch:>8}"
+                    f"{sequential * 1000:>12.3f} ms"
+                    f"{batched * 1000:>12.3f} ms"
+                )
+    finally:
+        keys = [key async for key in redis.scan_iter(f"{PREFIX}:*")]
+        if keys:
+            await redis.delete(*keys)
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS)
+    )
+    parser.add_argument("--batches", type=int, nargs="+", default=list(BATCHES))
+    # defaults to the largest batch, so a batch is not trimmed while put
+    parser.add_argument("--max-size", type=int, default=None)
+    args = parser.parse_args()
+    max_size = args.max_size or max(args.batches)
+    asyncio.run(main(args.backends, args.batches, max_size))
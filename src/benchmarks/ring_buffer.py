@@ -0,0 +1,137 @@
+"""
+Time writes and reads of ring buffer backends as they grow.
+
+Requires a running Redis, configured the same way as the app.
+Run from src: python -m benchmarks.ring_buffer
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from redis.asyncio import Redis, StrictRedis
+
+from config import settings
+from services.interfaces import IRingBuffer
+from services.memory import InMemoryRingBuffer
+from services.redis import RedisListRingBuffer, RedisRingBuffer, RedisStreamRingBuffer
+
+# per-slot HGET loop the hash scripts used before bulk HMGET, kept for comparison
+LEGACY_SNAPSHOT = """
+local head = tonumber(redis.call('GET', KEYS[1]) or "0")
+local max_size = tonumber(ARGV[1])
+local result = {}
+local size = math.min(head, max_size)
+for i = head - size, head - 1 do
+    local value = redis.call('HGET', KEYS[2], i % max_size)
+    if value then
+        table.insert(result, value)
+    end
+end
+return {head, result}
+"""
+
+BACKENDS: dict[str, Callable[[Redis, str, int], IRingBuffer[Any]]] = {
+    "hash": RedisRingBuffer,
+    "list": RedisListRingBuffer,
+    "stream": RedisStreamRingBuffer,
+    # baseline without redis, to tell its overhead from the one of python
+    "memory": lambda redis, name, max_size: InMemoryRingBuffer(max_size),
+}
+SIZES = (5, 50, 500, 1000, 5000, 10000)
+OPERATIONS = ("put", "all", "latest(10)", "since(half)")
+PREFIX = "benchmark:ring_buffer"
+
+
+async def measure(call: Callable[[], Awaitable[object]], repeat: int) -> float:
+    await call()  # warm up, loads scripts
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await call()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+async def fill(buffer: IRingBuffer[dict[str, int]], max_size: int) -> None:
+    await buffer.clear()
+    for i in range(max_size):
+        await buffer.put({"id": i})
+
+
+async def bench(
+    redis: Redis,
+    backend: str,
+    max_size: int,
+    repeat: int,
+) -> dict[str, float]:
+    buffer: IRingBuffer[dict[str, int]] = BACKENDS[backend](
+        redis, f"{PREFIX}:{backend}:{max_size}", max_size
+    )
+    await fill(buffer, max_size)
+
+    return {
+        "put": await measure(lambda: buffer.put({"id": max_size}), repeat),
+        "all": await measure(buffer.all, repeat),
+        "latest(10)": await measure(lambda: buffer.latest(10), repeat),
+        "since(half)": await measure(
+            lambda: buffer.since(max_size + repeat + 1 - max_size // 2), repeat
+        ),
+    }
+
+
+async def bench_legacy(redis: Redis, max_size: int, repeat: int) -> dict[str, float]:
+    name = f"{PREFIX}:hash:{max_size}"
+    await fill(RedisRingBuffer(redis, name, max_size), max_size)
+
+    legacy = redis.register_script(LEGACY_SNAPSHOT)
+    return {
+        "all": await measure(
+            lambda: legacy(keys=[f"{name}:head", f"{name}:data"], args=[max_size]),
+            repeat,
+        ),
+    }
+
+
+async def main(backends: list[str], sizes: list[int], repeat: int) -> None:
+    redis = StrictRedis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        password=settings.REDIS_PASSWORD,
+    )
+    try:
+        rtt = await measure(redis.ping, repeat)
+        print(f"PING round trip: {rtt:.3f} ms")
+        print(
+            f"{'backend':>14}{'max_size':>10}" + "".join(f"{o:>15}" for o in OPERATIONS)
+        )
+
+        for max_size in sizes:
+            rows = {b: await bench(redis, b, max_size, repeat) for b in backends}
+            if "hash" in backends:
+                rows["hash (HGET)"] = await bench_legacy(redis, max_size, repeat)
+
+            for backend, timings in rows.items():
+                print(
+                    f"{backend:>14}{max_size:>10}"
+                    + "".join(
+                        f"{timings[o]:>12.3f} ms" if o in timings else f"{'-':>15}"
+                        for o in OPERATIONS
+                    )
+                )
+    finally:
+        keys = [key async for key in redis.scan_iter(f"{PREFIX}:*")]
+        if keys:
+            await redis.delete(*keys)
+        await redis.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS)
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.backends, args.sizes, args.repeat))
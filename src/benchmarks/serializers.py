@@ -0,0 +1,58 @@
+"""
+Time encoding and decoding of ring buffer entries
+and measure their size with every serializer.
+
+Run from src: python -m benchmarks.serializers
+"""
+
+import argparse
+import timeit
+
+from schemas.changelog import ChangelogItemDict
+from schemas.locations import LocationDict
+from services.interfaces import ISerializer
+from services.serializers import JSONSerializer, MsgpackSerializer, PickleSerializer
+
+CHANGELOG_ITEM: ChangelogItemDict = {
+    "id": "c0ffee0123456789abcdef0123456789abcdef01",
+    "title": "Add a Redis list backed ring buffer",
+    "type": "push",
+    "description": "Reads are a single LRANGE with no wrap-around arithmetic",
+    "version": "1.4.0",
+    "date": "2025-06-14T12:30:00+03:00",
+}
+LOCATION_ITEM: LocationDict = {
+    "location": "Moscow, Russia",
+    "timestamp": "2025-06-14T12:30:00+03:00",
+}
+
+
+SERIALIZERS: dict[str, ISerializer[object]] = {
+    "pickle": PickleSerializer(),
+    "json (orjson)": JSONSerializer(),
+    "msgpack": MsgpackSerializer(),
+}
+
+
+def main(number: int) -> None:
+    print(f"{'item':>10}{'serializer':>16}{'dumps':>12}{'loads':>12}{'bytes':>8}")
+    for kind, item in (("changelog", CHANGELOG_ITEM), ("location", LOCATION_ITEM)):
+        for name, serializer in SERIALIZERS.items():
+            data = serializer.dumps(item)
+            assert serializer.loads(data) == item
+
+            dumps = timeit.timeit(lambda: serializer.dumps(item), number=number)
+            loads = timeit.timeit(lambda: serializer.loads(data), number=number)
+            print(
+                f"{kind:>10}{name:>16}"
+                f"{dumps / number * 1e6:>9.3f} us"
+                f"{loads / number * 1e6:>9.3f} us"
+                f"{len(data):>8}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.number)
@@ -1,4 +1,8 @@
+import asyncio
 import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any
 
 from fastapi import FastAPI
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
@@ -7,6 +11,8 @@ from uvicorn.middleware.proxy_headers import ProxyHeadersMiddleware
 
 import endpoints
 from config import di, settings
+from services.interfaces import IRingBuffer
+from utils.contexts import no_exc
 from utils.logging import get_config
 
 # fmt: off
@@ -17,7 +23,44 @@ logging.config.dictConfig(
 
 container = di.Container()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # redis is checked before services using it are provided,
+    # so they are built against the fallback if it is unreachable
+    await di.degrade_if_unavailable(container)
+
+    # buffers are ready before the first request comes,
+    # instead of initializing on it concurrently with others
+    ring_buffers: list[IRingBuffer[Any]] = [
+        container.changelog_ring_buffer(),
+        container.locations_ring_buffer(),
+    ]
+    results = await asyncio.gather(
+        *(ring_buffer.initialize() for ring_buffer in ring_buffers),
+        return_exceptions=True,
+    )
+    for ring_buffer, result in zip(ring_buffers, results):
+        if isinstance(result, Exception):
+            logging.error(f"Error initializing {ring_buffer} - {str(result)}")
+
+    presence = container.visitors_presence()
+    await presence.start()
+
+    yield
+
+    with no_exc():
+        await presence.stop()
+    with no_exc():
+        await container.unique_visitors().flush()
+    with no_exc():
+        await container.locations_publisher().stop()
+    with no_exc():
+        await container.redis().aclose()
+
+
 __app = FastAPI(
+    lifespan=lifespan,
     debug=settings.DEBUG,
     docs_url="/docs" if not settings.PROD else None,
     redoc_url="/redoc" if not settings.PROD else None,
@@ -1,4 +1,5 @@
 # fmt: off
+import asyncio
 import logging
 from copy import deepcopy
 
@@ -8,9 +9,17 @@ from redis.asyncio import Redis, StrictRedis
 
 from config import settings
 from schemas.changelog import ChangelogItemDict
-from schemas.locations import LocationDict
+from schemas.locations import IPEvent, LocationDict, get_location_timestamp
+from services.broadcast import CounterBroadcaster, RingBufferBroadcaster
+from services.cache import CachedRingBuffer
+from services.dedup import RecentKeys
 from services.github import hash_github_payload_and_compare
-from services.redis import RedisRingBuffer
+from services.memory import InMemoryRingBuffer
+from services.publishers import BatchPublisher, RedisStreamPublisher, SQSBatchPublisher
+from services.redis import RedisListRingBuffer, RedisRingBuffer, RedisStreamRingBuffer
+from services.serializers import JSONSerializer, MsgpackSerializer, PickleSerializer
+from services.visitors import PresenceCounter, UniqueVisitors
+from utils.contexts import no_exc
 
 
 def _validate_provider[T: providers.Provider](  # type:ignore[type-arg]
@@ -32,10 +41,34 @@ def _validate_provider[T: providers.Provider](  # type:ignore[type-arg]
     return (fallback_to or provider) if not ok else provider
 
 
+class RedisScriptFallback:
+    def __init__(self, script, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
+        self.script = script
+
+    async def __call__(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        return 0
+
+
+class RedisPubSubFallback:
+    async def subscribe(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        return
+
+    async def get_message(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        # nothing is ever published, waiting keeps pollers from spinning
+        await asyncio.sleep(kwargs.get("timeout") or 0.0)
+        return None
+
+    async def aclose(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        return
+
+
 class RedisFallback:
     def __init__(self, *args, **kwargs) -> None:  # type:ignore[no-untyped-def]
         self.__pipeline = []  # type:ignore[var-annotated]
 
+    async def ping(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        return True
+
     async def get(self, *args, **kwargs):  # type:ignore[no-untyped-def]
         self.__pipeline.append(None)
         return None
@@ -52,8 +85,23 @@ class RedisFallback:
     async def exists(self, *args, **kwargs):  # type:ignore[no-untyped-def]
         return False
 
-    def register_script(self, *args, **kwargs):  # type:ignore[no-untyped-def]
-        return
+    def register_script(self, script, *args, **kwargs):  # type:ignore[no-untyped-def]
+        return RedisScriptFallback(script)
+
+    async def script_load(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        self.__pipeline.append(None)
+
+    def pubsub(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        return RedisPubSubFallback()
+
+    async def pfadd(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        self.__pipeline.append(0)
+
+    async def pfcount(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        return 0
+
+    async def expire(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        self.__pipeline.append(False)
 
     def pipeline(self, *args, **kwargs):  # type:ignore[no-untyped-def]
         return RedisFallback()
@@ -63,16 +111,25 @@ class RedisFallback:
 
     incr = incrby
 
+    async def xadd(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        self.__pipeline.append(None)
+
     async def execute(self, *args, **kwargs):  # type:ignore[no-untyped-def]
         result = self.__pipeline.copy()
         self.__pipeline.clear()
         return result
 
+    async def aclose(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        return
+
 
 class BotoQueueFallback:
     def send_message(self, *args, **kwargs):  # type:ignore[no-untyped-def]
         return
 
+    def send_messages(self, *args, **kwargs):  # type:ignore[no-untyped-def]
+        return {}
+
 
 class BotoResourceFallback:
     def Queue(self, *args, **kwargs):  # type:ignore[no-untyped-def]
@@ -84,6 +141,17 @@ class BotoSessionFallback:
         return BotoResourceFallback()
 
 
+def _buffer_backend(degraded: bool, backend: str) -> str:
+    # without redis buffers are kept in memory of the process,
+    # live data is still served, though not shared between workers
+    return "memory" if degraded else backend
+
+
+def _dedup_redis(degraded: bool, redis: Redis) -> Redis | None:
+    # fallback redis never sets keys, that would suppress every event
+    return redis if settings.LOCATIONS_DEDUP_REDIS and not degraded else None
+
+
 class Container(containers.DeclarativeContainer):
     wiring_config = containers.WiringConfiguration(packages=["endpoints"])
 
@@ -99,24 +167,165 @@ class Container(containers.DeclarativeContainer):
         redis,
         fallback_to=providers.Singleton(RedisFallback),  # type:ignore[arg-type]
     )
+    # overridden at startup if redis does not answer, see degrade_if_unavailable
+    degraded = providers.Object(False)
 
-    changelog_ring_buffer: providers.Singleton[RedisRingBuffer[ChangelogItemDict]] = (
+    changelog_serializer = providers.Selector(
+        providers.Object(settings.CHANGELOG_BUFFER_SERIALIZER),
+        pickle=providers.Singleton(PickleSerializer),
+        json=providers.Singleton(JSONSerializer),
+        msgpack=providers.Singleton(MsgpackSerializer),
+    )
+    changelog_ring_buffer: providers.Singleton[CachedRingBuffer[ChangelogItemDict]] = (
         providers.Singleton(
-            RedisRingBuffer,
-            redis=redis,
-            name=settings.CHANGELOG_BUFFER_NAME,
-            max_size=settings.CHANGELOG_BUFFER_MAX_SIZE,
+            CachedRingBuffer,
+            # items expire without a change of the version, so cached
+            # reads are refreshed as often as the stream is polled
+            ttl=(
+                settings.CHANGELOG_SSE_INTERVAL_SECONDS
+                if settings.CHANGELOG_BUFFER_MAX_AGE_SECONDS
+                else None
+            ),
+            ring_buffer=providers.Selector(
+                providers.Callable(
+                    _buffer_backend,
+                    degraded=degraded,
+                    backend=settings.CHANGELOG_BUFFER_BACKEND,
+                ),
+                memory=providers.Singleton(
+                    InMemoryRingBuffer,
+                    max_size=settings.CHANGELOG_BUFFER_MAX_SIZE,
+                    max_age=settings.CHANGELOG_BUFFER_MAX_AGE_SECONDS,
+                ),
+                hash=providers.Singleton(
+                    RedisRingBuffer,
+                    redis=redis,
+                    name=settings.CHANGELOG_BUFFER_NAME,
+                    max_size=settings.CHANGELOG_BUFFER_MAX_SIZE,
+                    max_bytes=settings.CHANGELOG_BUFFER_MAX_BYTES,
+                    max_age=settings.CHANGELOG_BUFFER_MAX_AGE_SECONDS,
+                    serializer=changelog_serializer,
+                ),
+                list=providers.Singleton(
+                    RedisListRingBuffer,
+                    redis=redis,
+                    name=settings.CHANGELOG_BUFFER_NAME,
+                    max_size=settings.CHANGELOG_BUFFER_MAX_SIZE,
+                    max_bytes=settings.CHANGELOG_BUFFER_MAX_BYTES,
+                    max_age=settings.CHANGELOG_BUFFER_MAX_AGE_SECONDS,
+                    serializer=changelog_serializer,
+                ),
+                stream=providers.Singleton(
+                    RedisStreamRingBuffer,
+                    redis=redis,
+                    name=settings.CHANGELOG_BUFFER_NAME,
+                    max_size=settings.CHANGELOG_BUFFER_MAX_SIZE,
+                    max_bytes=settings.CHANGELOG_BUFFER_MAX_BYTES,
+                    max_age=settings.CHANGELOG_BUFFER_MAX_AGE_SECONDS,
+                    serializer=changelog_serializer,
+                ),
+            ),
         )
     )
-    locations_ring_buffer: providers.Singleton[RedisRingBuffer[LocationDict]] = (
+    locations_serializer = providers.Selector(
+        providers.Object(settings.LOCATIONS_BUFFER_SERIALIZER),
+        pickle=providers.Singleton(PickleSerializer),
+        json=providers.Singleton(JSONSerializer),
+        msgpack=providers.Singleton(MsgpackSerializer),
+    )
+    locations_ring_buffer: providers.Singleton[CachedRingBuffer[LocationDict]] = (
         providers.Singleton(
-            RedisRingBuffer,
-            redis=redis,
-            name=settings.LOCATIONS_BUFFER_NAME,
-            max_size=settings.LOCATIONS_BUFFER_MAX_SIZE,
+            CachedRingBuffer,
+            # items expire without a change of the version, so cached
+            # reads are refreshed as often as the stream is polled
+            ttl=(
+                settings.LOCATIONS_SSE_INTERVAL_SECONDS
+                if settings.LOCATIONS_BUFFER_MAX_AGE_SECONDS
+                else None
+            ),
+            ring_buffer=providers.Selector(
+                providers.Callable(
+                    _buffer_backend,
+                    degraded=degraded,
+                    backend=settings.LOCATIONS_BUFFER_BACKEND,
+                ),
+                memory=providers.Singleton(
+                    InMemoryRingBuffer,
+                    max_size=settings.LOCATIONS_BUFFER_MAX_SIZE,
+                    timestamp=get_location_timestamp,
+                    max_age=settings.LOCATIONS_BUFFER_MAX_AGE_SECONDS,
+                ),
+                hash=providers.Singleton(
+                    RedisRingBuffer,
+                    redis=redis,
+                    name=settings.LOCATIONS_BUFFER_NAME,
+                    max_size=settings.LOCATIONS_BUFFER_MAX_SIZE,
+                    timestamp=get_location_timestamp,
+                    max_bytes=settings.LOCATIONS_BUFFER_MAX_BYTES,
+                    max_age=settings.LOCATIONS_BUFFER_MAX_AGE_SECONDS,
+                    serializer=locations_serializer,
+                ),
+                list=providers.Singleton(
+                    RedisListRingBuffer,
+                    redis=redis,
+                    name=settings.LOCATIONS_BUFFER_NAME,
+                    max_size=settings.LOCATIONS_BUFFER_MAX_SIZE,
+                    timestamp=get_location_timestamp,
+                    max_bytes=settings.LOCATIONS_BUFFER_MAX_BYTES,
+                    max_age=settings.LOCATIONS_BUFFER_MAX_AGE_SECONDS,
+                    serializer=locations_serializer,
+                ),
+                stream=providers.Singleton(
+                    RedisStreamRingBuffer,
+                    redis=redis,
+                    name=settings.LOCATIONS_BUFFER_NAME,
+                    max_size=settings.LOCATIONS_BUFFER_MAX_SIZE,
+                    timestamp=get_location_timestamp,
+                    max_bytes=settings.LOCATIONS_BUFFER_MAX_BYTES,
+                    max_age=settings.LOCATIONS_BUFFER_MAX_AGE_SECONDS,
+                    serializer=locations_serializer,
+                ),
+            ),
         )
     )
 
+    changelog_broadcaster: providers.Singleton[RingBufferBroadcaster[ChangelogItemDict]] = (  # noqa:E501
+        providers.Singleton(
+            RingBufferBroadcaster,
+            ring_buffer=changelog_ring_buffer,
+            field="updates",
+            interval=settings.CHANGELOG_SSE_INTERVAL_SECONDS,
+        )
+    )
+    locations_broadcaster: providers.Singleton[RingBufferBroadcaster[LocationDict]] = (
+        providers.Singleton(
+            RingBufferBroadcaster,
+            ring_buffer=locations_ring_buffer,
+            field="locations",
+            interval=settings.LOCATIONS_SSE_INTERVAL_SECONDS,
+        )
+    )
+    visitors_presence: providers.Singleton[PresenceCounter] = providers.Singleton(
+        PresenceCounter,
+        redis=redis,
+        key=settings.REDIS_VISITORS_COUNTER_KEY,
+        interval=settings.VISITORS_HEARTBEAT_SECONDS,
+        ttl=settings.VISITORS_HEARTBEAT_TTL_SECONDS,
+    )
+    unique_visitors: providers.Singleton[UniqueVisitors] = providers.Singleton(
+        UniqueVisitors,
+        redis=redis,
+        prefix=settings.VISITORS_UNIQUE_KEY_PREFIX,
+        retention_days=settings.VISITORS_UNIQUE_RETENTION_DAYS,
+        flush_seconds=settings.VISITORS_UNIQUE_FLUSH_SECONDS,
+    )
+    visitors_broadcaster: providers.Singleton[CounterBroadcaster] = providers.Singleton(
+        CounterBroadcaster,
+        redis=redis,
+        key=settings.REDIS_VISITORS_COUNTER_KEY,
+        interval=settings.VISITORS_SSE_INTERVAL_SECONDS,
+    )
+
     hash_n_compare_github_payload_on_create = providers.Callable(
         hash_github_payload_and_compare,
         key=settings.GITHUB_CREATE_WEBHOOK_TOKEN,
@@ -151,3 +360,60 @@ class Container(containers.DeclarativeContainer):
         sqs_locations_queue,
         fallback_to=providers.Singleton(BotoQueueFallback),  # type:ignore[arg-type]
     )
+    locations_publisher: providers.Selector[BatchPublisher[IPEvent]] = (
+        providers.Selector(
+            providers.Object(settings.LOCATIONS_EVENTS_BACKEND),
+            sqs=providers.Singleton(
+                SQSBatchPublisher,
+                queue=sqs_locations_queue,
+                max_size=settings.SQS_LOCATIONS_PUBLISHER_MAX_SIZE,
+                batch_seconds=settings.SQS_LOCATIONS_PUBLISHER_BATCH_SECONDS,
+            ),
+            redis=providers.Singleton(
+                RedisStreamPublisher,
+                redis=redis,
+                stream=settings.LOCATIONS_EVENTS_STREAM,
+                max_size=settings.SQS_LOCATIONS_PUBLISHER_MAX_SIZE,
+                batch_size=settings.LOCATIONS_EVENTS_BATCH_SIZE,
+                batch_seconds=settings.SQS_LOCATIONS_PUBLISHER_BATCH_SECONDS,
+                max_len=settings.LOCATIONS_EVENTS_STREAM_MAX_LEN,
+            ),
+        )
+    )
+    locations_deduplicator = providers.Singleton(
+        RecentKeys,
+        ttl=settings.LOCATIONS_SECONDS_CONSIDER_AS_NEW,
+        max_size=settings.LOCATIONS_DEDUP_MAX_SIZE,
+        redis=providers.Callable(
+            _dedup_redis,
+            degraded=degraded,
+            redis=redis,
+        ),
+        prefix=settings.LOCATIONS_DEDUP_KEY_PREFIX,
+    )
+
+
+async def degrade_if_unavailable(container: Container) -> bool:
+    """
+    Checks redis is reachable and switches the container to
+    the fallback redis and in-memory buffers if it is not.
+    Must run before any service using redis is provided.
+
+    :param container: Container of the app
+    :type container: Container
+    :return: True if the container is degraded, False otherwise
+    :rtype: bool
+    """
+    redis = container.redis()
+    try:
+        await redis.ping()
+    except Exception as e:
+        logging.error(f"Error connecting to redis, running degraded - {str(e)}")
+    else:
+        return False
+
+    with no_exc():
+        await redis.aclose()
+    container.redis.override(providers.Singleton(RedisFallback))
+    container.degraded.override(True)
+    return True
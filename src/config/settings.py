@@ -17,8 +17,11 @@ from schemas.project import Project
 from schemas.python import Python
 from schemas.stack import Stack
 from validators import (
+    validator_app_ring_buffer_backend,
+    validator_events_backend,
     validator_int,
     validator_int_boolean,
+    validator_serializer,
     validator_template,
     validator_timezone,
     validator_url,
@@ -125,6 +128,48 @@ SQS_LOCATIONS_SECRET_KEY = load("SQS_LOCATIONS_SECRET_KEY", "")
 SQS_LOCATIONS_ENDPOINT_URL = load("SQS_LOCATIONS_ENDPOINT_URL", "")
 SQS_LOCATIONS_QUEUE_URL = load("SQS_LOCATIONS_QUEUE_URL", "")
 SQS_LOCATIONS_REGION_NAME = load("SQS_LOCATIONS_REGION_NAME", "")
+SQS_LOCATIONS_PUBLISHER_MAX_SIZE: int = load(
+    "SQS_LOCATIONS_PUBLISHER_MAX_SIZE",
+    1000,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+SQS_LOCATIONS_PUBLISHER_BATCH_SECONDS: int = load(
+    "SQS_LOCATIONS_PUBLISHER_BATCH_SECONDS",
+    1,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+
+# redis publishes location events to a stream instead of SQS,
+# publisher queue size and batch seconds are the same as for SQS
+LOCATIONS_EVENTS_BACKEND: str = load(
+    "LOCATIONS_EVENTS_BACKEND",
+    "sqs",
+    ensure_not_empty=True,
+    validator=validator_events_backend,
+)
+LOCATIONS_EVENTS_STREAM: str = load(
+    "LOCATIONS_EVENTS_STREAM",
+    "events:locations",
+    ensure_not_empty=True,
+)
+LOCATIONS_EVENTS_STREAM_MAX_LEN: int = load(
+    "LOCATIONS_EVENTS_STREAM_MAX_LEN",
+    100000,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+LOCATIONS_EVENTS_BATCH_SIZE: int = load(
+    "LOCATIONS_EVENTS_BATCH_SIZE",
+    100,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
 
 GITHUB_CREATE_WEBHOOK_TOKEN: str = load("GITHUB_CREATE_WEBHOOK_TOKEN", "")
 GITHUB_TAG_PATTERN: str = load(
@@ -183,6 +228,14 @@ PROXY_TRUSTED_HOSTS = load(
 
 IMAGE_TAG = load("IMAGE_TAG", "latest", ensure_not_empty=True)
 
+SSE_PING_SECONDS: int = load(
+    "SSE_PING_SECONDS",
+    15,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+
 VISITORS_SSE_INTERVAL_SECONDS: int = load(
     "VISITORS_SSE_INTERVAL_SECONDS",
     1,
@@ -190,6 +243,39 @@ VISITORS_SSE_INTERVAL_SECONDS: int = load(
     ensure_not_empty=True,
     validator=validator_int,
 )
+VISITORS_HEARTBEAT_SECONDS: int = load(
+    "VISITORS_HEARTBEAT_SECONDS",
+    2,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+VISITORS_HEARTBEAT_TTL_SECONDS: int = load(
+    "VISITORS_HEARTBEAT_TTL_SECONDS",
+    10,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+VISITORS_UNIQUE_KEY_PREFIX: str = load(
+    "VISITORS_UNIQUE_KEY_PREFIX",
+    "visitors:unique",
+    ensure_not_empty=True,
+)
+VISITORS_UNIQUE_RETENTION_DAYS: int = load(
+    "VISITORS_UNIQUE_RETENTION_DAYS",
+    90,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+VISITORS_UNIQUE_FLUSH_SECONDS: int = load(
+    "VISITORS_UNIQUE_FLUSH_SECONDS",
+    1,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
 
 CHANGELOG_SSE_INTERVAL_SECONDS: int = load(
     "CHANGELOG_SSE_INTERVAL_SECONDS",
@@ -210,6 +296,35 @@ CHANGELOG_BUFFER_MAX_SIZE: int = load(
     ensure_not_empty=True,
     validator=validator_int,
 )
+CHANGELOG_BUFFER_BACKEND: str = load(
+    "CHANGELOG_BUFFER_BACKEND",
+    "hash",
+    ensure_not_empty=True,
+    validator=validator_app_ring_buffer_backend,
+)
+# readers detect the format of every entry, pickle stays the
+# default until every reader is deployed, then json is switched on
+CHANGELOG_BUFFER_SERIALIZER: str = load(
+    "CHANGELOG_BUFFER_SERIALIZER",
+    "pickle",
+    ensure_not_empty=True,
+    validator=validator_serializer,
+)
+# 0 disables the limit
+CHANGELOG_BUFFER_MAX_BYTES: int = load(
+    "CHANGELOG_BUFFER_MAX_BYTES",
+    0,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+CHANGELOG_BUFFER_MAX_AGE_SECONDS: int = load(
+    "CHANGELOG_BUFFER_MAX_AGE_SECONDS",
+    0,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
 
 LOCATIONS_SSE_INTERVAL_SECONDS: int = load(
     "LOCATIONS_SSE_INTERVAL_SECONDS",
@@ -230,6 +345,65 @@ LOCATIONS_BUFFER_MAX_SIZE: int = load(
     ensure_not_empty=True,
     validator=validator_int,
 )
+LOCATIONS_BUFFER_BACKEND: str = load(
+    "LOCATIONS_BUFFER_BACKEND",
+    "hash",
+    ensure_not_empty=True,
+    validator=validator_app_ring_buffer_backend,
+)
+# readers detect the format of every entry, pickle stays the
+# default until every reader is deployed, then json is switched on
+LOCATIONS_BUFFER_SERIALIZER: str = load(
+    "LOCATIONS_BUFFER_SERIALIZER",
+    "pickle",
+    ensure_not_empty=True,
+    validator=validator_serializer,
+)
+# 0 disables the limit
+LOCATIONS_BUFFER_MAX_BYTES: int = load(
+    "LOCATIONS_BUFFER_MAX_BYTES",
+    0,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+LOCATIONS_BUFFER_MAX_AGE_SECONDS: int = load(
+    "LOCATIONS_BUFFER_MAX_AGE_SECONDS",
+    0,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+# same window as in the function, visitors
+# are not reported again within it
+LOCATIONS_SECONDS_CONSIDER_AS_NEW: int = load(
+    "LOCATIONS_SECONDS_CONSIDER_AS_NEW",
+    60 * 60 * 24,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+LOCATIONS_DEDUP_MAX_SIZE: int = load(
+    "LOCATIONS_DEDUP_MAX_SIZE",
+    10000,
+    cast_to=int,
+    ensure_not_empty=True,
+    validator=validator_int,
+)
+LOCATIONS_DEDUP_REDIS: bool = bool(
+    load(
+        "LOCATIONS_DEDUP_REDIS",
+        1,
+        cast_to=int,
+        ensure_not_empty=True,
+        validator=validator_int_boolean,
+    )
+)
+LOCATIONS_DEDUP_KEY_PREFIX: str = load(
+    "LOCATIONS_DEDUP_KEY_PREFIX",
+    "locations:reported",
+    ensure_not_empty=True,
+)
 
 HTML_FOR_HOME = load(
     "HTML_FOR_HOME",
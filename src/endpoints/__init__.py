@@ -3,12 +3,16 @@ from fastapi import APIRouter
 from endpoints.changelog import router as changelog_router
 from endpoints.frontend import router as frontend_router
 from endpoints.locations import router as locations_router
+from endpoints.snapshot import router as snapshot_router
+from endpoints.stream import router as stream_router
 from endpoints.visitors import router as visitors_router
 
 api_router = APIRouter(prefix="/api/v1", tags=["API"])
 api_router.include_router(changelog_router)
 api_router.include_router(locations_router)
 api_router.include_router(visitors_router)
+api_router.include_router(snapshot_router)
+api_router.include_router(stream_router)
 
 
 def get_routers() -> tuple[APIRouter, ...]:
@@ -1,19 +1,25 @@
-import asyncio
-import json
+import math
 import re
 from collections.abc import AsyncGenerator
 from datetime import datetime
 from typing import cast
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, Request, Response
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sse_starlette.sse import EventSourceResponse
 
 from config import settings
 from config.di import Container
 from schemas.changelog import Changelog, ChangelogItem, ChangelogItemDict
 from schemas.webhooks import GitHubCreateHook
-from services.interfaces import IHashAndCompare, IRingBuffer
+from services.interfaces import (
+    IEncodedRingBuffer,
+    IHashAndCompare,
+    IResumableBroadcaster,
+    IRingBuffer,
+)
+from services.serializers import json_dumps
+from utils.sse import get_last_event_id, listen
 
 router = APIRouter(prefix="/changelog", tags=["changelog"])
 
@@ -21,47 +27,46 @@ router = APIRouter(prefix="/changelog", tags=["changelog"])
 @router.get("", response_model=Changelog)
 @inject
 async def changelog(
-    ring_buffer: IRingBuffer[ChangelogItemDict] = Depends(
+    since: float | None = Query(
+        None,
+        description="Unix timestamp to return updates made since",
+    ),
+    ring_buffer: IEncodedRingBuffer[ChangelogItemDict] = Depends(
         Provide[Container.changelog_ring_buffer]
     ),
-) -> Changelog:
-    items = await ring_buffer.all()
-    return Changelog(
-        updates=[
-            ChangelogItem(
-                id=item["id"],
-                title=item["title"],
-                type=item["type"],
-                description=item["description"],
-                version=item["version"],
-                date=item["date"],
-            )
-            for item in items
-        ]
-    )
+) -> Response:
+    if since is not None:
+        items = await ring_buffer.range(since, math.inf)
+        return Response(
+            json_dumps({"updates": items}),
+            media_type="application/json",
+        )
+
+    # items are validated on put, the document
+    # is sent as is, without building models again
+    _, content = await ring_buffer.encoded("updates")
+    return Response(content, media_type="application/json")
 
 
 @router.get("/stream")
 @inject
 async def stream(
     request: Request,
-    ring_buffer: IRingBuffer[ChangelogItemDict] = Depends(
-        Provide[Container.changelog_ring_buffer]
+    broadcaster: IResumableBroadcaster[dict[str, str]] = Depends(
+        Provide[Container.changelog_broadcaster]
     ),
 ) -> EventSourceResponse:
     async def generator() -> AsyncGenerator[dict[str, str]]:
-        while True:
-            if await request.is_disconnected():
-                break
-
-            yield {
-                "event": "message",
-                "data": json.dumps({"updates": await ring_buffer.all()}),
-            }
+        last_event_id = None
+        cursor = get_last_event_id(request)
+        if cursor is not None and (event := await broadcaster.resume(cursor)):
+            last_event_id = event["id"]
+            yield event
 
-            await asyncio.sleep(settings.CHANGELOG_SSE_INTERVAL_SECONDS)
+        async for event in listen(broadcaster, last_event_id):
+            yield event
 
-    return EventSourceResponse(generator())
+    return EventSourceResponse(generator(), ping=settings.SSE_PING_SECONDS)
 
 
 @router.post("/webhook")
@@ -1,30 +1,51 @@
 from typing import Any
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, Request
 from fastapi.responses import HTMLResponse
 
 from config import settings
+from endpoints.locations import report_location
+from endpoints.snapshot import get_snapshot
+from endpoints.visitors import record_visit
 from utils.templates import templates
 
-router = APIRouter(tags=["pages"])
+# pages render the snapshot, so visits are reported the same way
+router = APIRouter(
+    tags=["pages"],
+    dependencies=[Depends(record_visit), Depends(report_location)],
+)
+
+
+def _context(snapshot: bytes | None) -> dict[str, Any]:
+    # widgets paint from the snapshot without requests of their own,
+    # "<" is escaped so values can not close the script tag
+    return settings.TEMPLATE_CONTEXT_BASE | {
+        "SNAPSHOT": snapshot.replace(b"<", b"\\u003c").decode() if snapshot else None
+    }
 
 
 @router.get("/", response_class=HTMLResponse)
 @router.get("/home", response_class=HTMLResponse)
-async def home(request: Request) -> Any:
+async def home(
+    request: Request,
+    snapshot: bytes | None = Depends(get_snapshot),
+) -> Any:
     return templates.TemplateResponse(
         request=request,
         name=settings.HTML_FOR_HOME,
-        context=settings.TEMPLATE_CONTEXT_BASE | {"lines": settings.HOME},
+        context=_context(snapshot) | {"lines": settings.HOME},
     )
 
 
 @router.get("/experience", response_class=HTMLResponse)
-async def experience(request: Request) -> Any:
+async def experience(
+    request: Request,
+    snapshot: bytes | None = Depends(get_snapshot),
+) -> Any:
     return templates.TemplateResponse(
         request=request,
         name=settings.HTML_FOR_EXPERIENCE,
-        context=settings.TEMPLATE_CONTEXT_BASE
+        context=_context(snapshot)
         | {
             "timeline": [
                 {
@@ -41,29 +62,38 @@ async def experience(request: Request) -> Any:
 
 
 @router.get("/stack", response_class=HTMLResponse)
-async def stack(request: Request) -> Any:
+async def stack(
+    request: Request,
+    snapshot: bytes | None = Depends(get_snapshot),
+) -> Any:
     return templates.TemplateResponse(
         request=request,
         name=settings.HTML_FOR_STACK,
-        context=settings.TEMPLATE_CONTEXT_BASE | {"stack": settings.STACK},
+        context=_context(snapshot) | {"stack": settings.STACK},
     )
 
 
 @router.get("/python", response_class=HTMLResponse)
-async def python(request: Request) -> Any:
+async def python(
+    request: Request,
+    snapshot: bytes | None = Depends(get_snapshot),
+) -> Any:
     return templates.TemplateResponse(
         request=request,
         name=settings.HTML_FOR_PYTHON,
-        context=settings.TEMPLATE_CONTEXT_BASE | {"libraries": settings.PYTHON},
+        context=_context(snapshot) | {"libraries": settings.PYTHON},
     )
 
 
 @router.get("/books", response_class=HTMLResponse)
-async def books(request: Request) -> Any:
+async def books(
+    request: Request,
+    snapshot: bytes | None = Depends(get_snapshot),
+) -> Any:
     return templates.TemplateResponse(
         request=request,
         name=settings.HTML_FOR_BOOKS,
-        context=settings.TEMPLATE_CONTEXT_BASE
+        context=_context(snapshot)
         | {
             "work_books": settings.WORK_BOOKS,
             "off_work_books": settings.OFF_WORK_BOOKS,
@@ -72,9 +102,12 @@ async def books(request: Request) -> Any:
 
 
 @router.get("/projects", response_class=HTMLResponse)
-async def projects(request: Request) -> Any:
+async def projects(
+    request: Request,
+    snapshot: bytes | None = Depends(get_snapshot),
+) -> Any:
     return templates.TemplateResponse(
         request=request,
         name=settings.HTML_FOR_PROJECTS,
-        context=settings.TEMPLATE_CONTEXT_BASE | {"projects": settings.PROJECTS},
+        context=_context(snapshot) | {"projects": settings.PROJECTS},
     )
@@ -1,76 +1,91 @@
-import asyncio
-import json
+import math
 from collections.abc import AsyncGenerator
-from datetime import datetime
-from typing import TYPE_CHECKING, Any, TypeAlias
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sse_starlette.sse import EventSourceResponse
 
-if TYPE_CHECKING:
-    from types_boto3_sqs.service_resource import Queue
-else:
-    Queue: TypeAlias = Any
-
 from config import settings
 from config.di import Container
-from schemas.locations import IPEvent, Location, LocationDict, Locations
-from services.interfaces import IRingBuffer
+from endpoints.visitors import record_visit
+from schemas.locations import IPEvent, LocationDict, Locations
+from services.interfaces import (
+    IDeduplicator,
+    IEncodedRingBuffer,
+    IEventPublisher,
+    IResumableBroadcaster,
+)
+from services.locations import ip_event
+from services.serializers import json_dumps
+from utils.sse import get_last_event_id, listen
 
 router = APIRouter(prefix="/locations", tags=["locations"])
 
 
-@router.get("", response_model=Locations)
 @inject
-async def locations(
+async def report_location(
     request: Request,
-    ring_buffer: IRingBuffer[LocationDict] = Depends(
+    publisher: IEventPublisher[IPEvent] = Depends(
+        Provide[Container.locations_publisher]
+    ),
+    deduplicator: IDeduplicator = Depends(Provide[Container.locations_deduplicator]),
+) -> None:
+    # visitors reported recently are not reported again, their
+    # locations would be thrown away by the function anyway
+    if not request.client or not settings.PROD:
+        return
+    host = request.client.host
+    if not await deduplicator.first_seen(host):
+        return
+    # dropped events are reported again by the next request
+    if not publisher.publish(ip_event(host)):
+        await deduplicator.forget(host)
+
+
+@router.get(
+    "",
+    response_model=Locations,
+    dependencies=[Depends(record_visit), Depends(report_location)],
+)
+@inject
+async def locations(
+    since: float | None = Query(
+        None,
+        description="Unix timestamp to return locations seen since",
+    ),
+    ring_buffer: IEncodedRingBuffer[LocationDict] = Depends(
         Provide[Container.locations_ring_buffer]
     ),
-    queue: Queue = Depends(Provide[Container.sqs_locations_queue]),
-) -> Locations:
-    if request.client and settings.PROD:
-        queue.send_message(
-            MessageBody=json.dumps(
-                IPEvent(
-                    ip=request.client.host,
-                    timestamp=str(datetime.now().timestamp()),
-                ).model_dump()
-            ),
-            MessageGroupId="default",
+) -> Response:
+    if since is not None:
+        items = await ring_buffer.range(since, math.inf)
+        return Response(
+            json_dumps({"locations": items}),
+            media_type="application/json",
         )
 
-    _locations = await ring_buffer.all()
-    return Locations(
-        locations=[
-            Location(
-                location=location["location"],
-                timestamp=location["timestamp"],
-            )
-            for location in _locations
-        ]
-    )
+    # items are validated on put, the document
+    # is sent as is, without building models again
+    _, content = await ring_buffer.encoded("locations")
+    return Response(content, media_type="application/json")
 
 
 @router.get("/stream")
 @inject
 async def stream(
     request: Request,
-    ring_buffer: IRingBuffer[LocationDict] = Depends(
-        Provide[Container.locations_ring_buffer]
+    broadcaster: IResumableBroadcaster[dict[str, str]] = Depends(
+        Provide[Container.locations_broadcaster]
     ),
 ) -> EventSourceResponse:
     async def generator() -> AsyncGenerator[dict[str, str]]:
-        while True:
-            if await request.is_disconnected():
-                break
-
-            yield {
-                "event": "message",
-                "data": json.dumps({"locations": await ring_buffer.all()}),
-            }
+        last_event_id = None
+        cursor = get_last_event_id(request)
+        if cursor is not None and (event := await broadcaster.resume(cursor)):
+            last_event_id = event["id"]
+            yield event
 
-            await asyncio.sleep(settings.LOCATIONS_SSE_INTERVAL_SECONDS)
+        async for event in listen(broadcaster, last_event_id):
+            yield event
 
-    return EventSourceResponse(generator())
+    return EventSourceResponse(generator(), ping=settings.SSE_PING_SECONDS)
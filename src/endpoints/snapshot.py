@@ -0,0 +1,52 @@
+import logging
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, Depends, Response
+from redis.asyncio import Redis
+
+from config import settings
+from config.di import Container
+from endpoints.locations import report_location
+from endpoints.visitors import record_visit
+from schemas.changelog import ChangelogItemDict
+from schemas.locations import LocationDict
+from schemas.snapshot import Snapshot
+from services.interfaces import IEncodedRingBuffer
+from services.snapshot import encode_snapshot
+
+router = APIRouter(prefix="/snapshot", tags=["snapshot"])
+
+
+@inject
+async def get_snapshot(
+    changelog_ring_buffer: IEncodedRingBuffer[ChangelogItemDict] = Depends(
+        Provide[Container.changelog_ring_buffer]
+    ),
+    locations_ring_buffer: IEncodedRingBuffer[LocationDict] = Depends(
+        Provide[Container.locations_ring_buffer]
+    ),
+    redis: Redis = Depends(Provide[Container.redis]),
+) -> bytes | None:
+    try:
+        return await encode_snapshot(
+            changelog_ring_buffer,
+            locations_ring_buffer,
+            redis,
+            settings.REDIS_VISITORS_COUNTER_KEY,
+        )
+    except Exception as e:
+        logging.error(f"Error encoding snapshot - {str(e)}")
+        return None
+
+
+# snapshot replaces the request to locations,
+# so the visit is reported the same way
+@router.get(
+    "",
+    response_model=Snapshot,
+    dependencies=[Depends(record_visit), Depends(report_location)],
+)
+async def snapshot(snapshot: bytes | None = Depends(get_snapshot)) -> Response:
+    if snapshot is None:
+        return Response("Snapshot is not available", status_code=503)
+    return Response(snapshot, media_type="application/json")
@@ -0,0 +1,103 @@
+from collections.abc import AsyncGenerator
+
+from dependency_injector.wiring import Provide, inject
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request, Response
+from sse_starlette.sse import EventSourceResponse
+
+from config import settings
+from config.di import Container
+from services.interfaces import IBroadcaster, IPresence, IResumableBroadcaster
+from utils.contexts import no_exc
+from utils.sse import format_last_event_ids, get_last_event_ids, listen_many
+
+router = APIRouter(prefix="/stream", tags=["stream"])
+
+
+@router.get("")
+@inject
+async def stream(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    topics: str = Query(
+        "changelog,locations,visitors",
+        description="Comma separated topics to stream",
+    ),
+    presence: IPresence = Depends(Provide[Container.visitors_presence]),
+    changelog_broadcaster: IResumableBroadcaster[dict[str, str]] = Depends(
+        Provide[Container.changelog_broadcaster]
+    ),
+    locations_broadcaster: IResumableBroadcaster[dict[str, str]] = Depends(
+        Provide[Container.locations_broadcaster]
+    ),
+    visitors_broadcaster: IBroadcaster[dict[str, str]] = Depends(
+        Provide[Container.visitors_broadcaster]
+    ),
+) -> EventSourceResponse:
+    resumable: dict[str, IResumableBroadcaster[dict[str, str]]] = {
+        "changelog": changelog_broadcaster,
+        "locations": locations_broadcaster,
+    }
+    broadcasters: dict[str, IBroadcaster[dict[str, str]]] = {
+        **resumable,
+        "visitors": visitors_broadcaster,
+    }
+    selected = {
+        topic: broadcasters[topic]
+        for topic in topics.split(",")
+        if topic in broadcasters
+    }
+    if not selected:
+        return Response(  # type:ignore[return-value]
+            "No known topics requested",
+            status_code=400,
+        )
+
+    def named(topic: str, event: dict[str, str]) -> str:
+        # "message" events are named after the topic,
+        # other kinds get the topic as a prefix, e.g. "changelog-delta"
+        kind = event.get("event", "message")
+        return topic if kind == "message" else f"{topic}-{kind}"
+
+    async def generator() -> AsyncGenerator[dict[str, str]]:
+        # the id of every event carries versions of all resumable topics
+        versions: dict[str, str] = {}
+        for topic, cursor in get_last_event_ids(request).items():
+            if topic not in selected or topic not in resumable:
+                continue
+            event = await resumable[topic].resume(cursor)
+            if event is None:
+                continue
+            versions[topic] = event["id"]
+            yield event | {
+                "id": format_last_event_ids(versions),
+                "event": named(topic, event),
+            }
+
+        async for topic, event in listen_many(selected, versions.copy()):
+            multiplexed = event | {"event": named(topic, event)}
+            if "id" in event:
+                versions[topic] = event["id"]
+                multiplexed["id"] = format_last_event_ids(versions)
+            yield multiplexed
+
+    if "visitors" not in selected:
+        return EventSourceResponse(generator(), ping=settings.SSE_PING_SECONDS)
+
+    async def counted() -> AsyncGenerator[dict[str, str]]:
+        with no_exc():
+            async for event in generator():
+                yield event
+
+    async def cleanup() -> None:
+        presence.leave()
+
+    # counted before the response, so the cleanup
+    # always has a connection to remove
+    presence.join()
+    background_tasks.add_task(cleanup)
+
+    return EventSourceResponse(
+        counted(),
+        background=background_tasks,
+        ping=settings.SSE_PING_SECONDS,
+    )
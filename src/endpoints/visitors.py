@@ -1,69 +1,79 @@
-import asyncio
-import json
 from collections.abc import AsyncGenerator
 
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, BackgroundTasks, Depends, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, Query, Request
 from redis.asyncio import Redis
 from sse_starlette.sse import EventSourceResponse
 
 from config import settings
 from config.di import Container
-from schemas.visitors import Visitors
+from schemas.visitors import UniqueVisitors, Visitors
+from services.interfaces import IBroadcaster, IPresence, IUniqueVisitors
+from services.visitors import get_visitors_count
 from utils.contexts import no_exc
+from utils.sse import listen
 
 router = APIRouter(prefix="/visitors", tags=["visitors"])
 
 
+@inject
+async def record_visit(
+    request: Request,
+    unique_visitors: IUniqueVisitors = Depends(Provide[Container.unique_visitors]),
+) -> None:
+    if request.client:
+        unique_visitors.record(request.client.host)
+
+
 @router.get("", response_model=Visitors)
 @inject
 async def count(
     redis: Redis = Depends(Provide[Container.redis]),
 ) -> Visitors:
-    count = await redis.get(settings.REDIS_VISITORS_COUNTER_KEY)
-    count = int(count) if count else 0
+    count = await get_visitors_count(redis, settings.REDIS_VISITORS_COUNTER_KEY)
     return Visitors(count=count)
 
 
+@router.get("/unique", response_model=UniqueVisitors)
+@inject
+async def unique(
+    days: int = Query(
+        1,
+        ge=1,
+        le=settings.VISITORS_UNIQUE_RETENTION_DAYS,
+        description="Number of days to count visitors for, including today",
+    ),
+    unique_visitors: IUniqueVisitors = Depends(Provide[Container.unique_visitors]),
+) -> UniqueVisitors:
+    count = await unique_visitors.count(days)
+    return UniqueVisitors(count=count, days=days)
+
+
 @router.get("/stream")
 @inject
 async def stream(
-    request: Request,
     background_tasks: BackgroundTasks,
-    redis: Redis = Depends(Provide[Container.redis]),
+    presence: IPresence = Depends(Provide[Container.visitors_presence]),
+    broadcaster: IBroadcaster[dict[str, str]] = Depends(
+        Provide[Container.visitors_broadcaster]
+    ),
 ) -> EventSourceResponse:
-    async def update(increment: int = 0) -> int:
-        pipe = redis.pipeline(transaction=True)
-        await pipe.incr(settings.REDIS_VISITORS_COUNTER_KEY, increment)
-        await pipe.get(settings.REDIS_VISITORS_COUNTER_KEY)
-        results = await pipe.execute()
-
-        count = int(results[1] or 0)
-
-        if count < 0:
-            await redis.set(settings.REDIS_VISITORS_COUNTER_KEY, 0)
-            return 0
-
-        return count
-
     async def generator() -> AsyncGenerator[dict[str, str]]:
         with no_exc():
-            count = await update(+1)
-
-            yield {"event": "message", "data": json.dumps({"count": count})}
-            while True:
-                if await request.is_disconnected():
-                    break
-
-                count = await update()
-
-                yield {"event": "message", "data": json.dumps({"count": count})}
-
-                await asyncio.sleep(settings.VISITORS_SSE_INTERVAL_SECONDS)
+            async for event in listen(broadcaster):
+                yield event
 
     async def cleanup() -> None:
-        _ = await update(-1)
+        presence.leave()
+
+    # counted before the response, so the cleanup
+    # always has a connection to remove
+    presence.join()
 
     background_tasks.add_task(cleanup)
 
-    return EventSourceResponse(generator(), background=background_tasks)
+    return EventSourceResponse(
+        generator(),
+        background=background_tasks,
+        ping=settings.SSE_PING_SECONDS,
+    )
@@ -1,3 +1,4 @@
-redis.call('DEL', KEYS[2])
+redis.call('DEL', KEYS[2], KEYS[4], KEYS[5], KEYS[6])
 redis.call('SET', KEYS[1], 0)
+redis.call('PUBLISH', KEYS[3], 0)
 return 1
@@ -0,0 +1,17 @@
+-- Index values written before the index existed, sequence numbers
+-- are followed by timestamps, values evicted since they were read
+-- and values indexed meanwhile are skipped
+local head = tonumber(redis.call('GET', KEYS[1]) or "0")
+local tail = tonumber(redis.call('GET', KEYS[2]) or "0")
+local max_size = tonumber(ARGV[1])
+local oldest = math.max(tail, head - max_size)
+
+local added = 0
+for j = 2, #ARGV, 2 do
+    local sequence = tonumber(ARGV[j])
+    if sequence >= oldest and sequence < head then
+        added = added + redis.call('ZADD', KEYS[3], 'NX', ARGV[j + 1], sequence)
+    end
+end
+
+return added
@@ -0,0 +1,41 @@
+local head = tonumber(redis.call('GET', KEYS[1]) or "0")
+local tail = tonumber(redis.call('GET', KEYS[4]) or "0")
+local max_size = tonumber(ARGV[1])
+local max_age = tonumber(ARGV[4])
+local now = tonumber(ARGV[5])
+local oldest = math.max(tail, head - max_size)
+
+-- Values older than max_age are skipped even if nothing evicted them yet
+local min_score = ARGV[2]
+if max_age > 0 and tonumber(min_score) < now - max_age then
+    min_score = now - max_age
+end
+
+-- Sequence numbers of values with timestamps in the range,
+-- values written before the index existed are not there
+local sequences = {}
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], min_score, ARGV[3])) do
+    local sequence = tonumber(member)
+    if sequence >= oldest and sequence < head then
+        sequences[#sequences + 1] = sequence
+    end
+end
+if #sequences == 0 then
+    return {}
+end
+table.sort(sequences)
+
+-- Value with sequence number s is at index head - 1 - s,
+-- read the span of the range once and pick values from it
+local newest = sequences[#sequences]
+local values = redis.call('LRANGE', KEYS[2], head - 1 - newest, head - 1 - sequences[1])
+
+local result = {}
+for _, sequence in ipairs(sequences) do
+    local value = values[newest - sequence + 1]
+    if value then
+        result[#result + 1] = value
+    end
+end
+
+return result
@@ -0,0 +1,28 @@
+local instance = ARGV[1]
+local connections = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+
+-- Instances that missed their heartbeats died or were
+-- restarted, their connections are not counted anymore
+for _, expired in ipairs(redis.call('ZRANGEBYSCORE', KEYS[3], '-inf', now)) do
+    redis.call('HDEL', KEYS[2], expired)
+    redis.call('ZREM', KEYS[3], expired)
+end
+
+-- Store connections of the instance until the next heartbeat is due
+redis.call('HSET', KEYS[2], instance, connections)
+redis.call('ZADD', KEYS[3], now + ttl, instance)
+
+-- Total is stored for readers, so it is a single GET for them,
+-- every key goes away if no instance is alive to refresh it
+local total = 0
+for _, count in ipairs(redis.call('HVALS', KEYS[2])) do
+    total = total + tonumber(count)
+end
+local seconds = math.ceil(ttl)
+redis.call('SET', KEYS[1], total, 'EX', seconds)
+redis.call('EXPIRE', KEYS[2], seconds)
+redis.call('EXPIRE', KEYS[3], seconds)
+
+return total
@@ -20,3 +20,7 @@ class Locations(BaseModel):
 class IPEvent(BaseModel):
     ip: str
     timestamp: str
+
+
+def get_location_timestamp(location: LocationDict) -> float:
+    return float(location["timestamp"])
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+from schemas.changelog import Changelog
+from schemas.locations import Locations
+from schemas.visitors import Visitors
+
+
+class Snapshot(BaseModel):
+    changelog: Changelog
+    locations: Locations
+    visitors: Visitors
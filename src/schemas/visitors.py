@@ -3,3 +3,8 @@ from pydantic import BaseModel, Field
 
 class Visitors(BaseModel):
     count: int = Field(..., description="Number of current visitors")
+
+
+class UniqueVisitors(BaseModel):
+    count: int = Field(..., description="Approximate number of unique visitors")
+    days: int = Field(..., description="Number of days visitors are counted for")
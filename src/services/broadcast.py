@@ -0,0 +1,189 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+
+from redis.asyncio import Redis
+
+from services.interfaces import IBroadcaster, IEncodedRingBuffer, IResumableBroadcaster
+from services.serializers import json_dumps
+
+
+class Broadcaster[T](IBroadcaster[T], ABC):
+    def __init__(self, interval: float) -> None:
+        """
+        :param interval: Seconds between two version checks of the topic
+        :type interval: float
+        """
+        self._interval = interval
+        self.__subscribers: set[asyncio.Queue[T]] = set()
+        self.__task: asyncio.Task[None] | None = None
+        self.__version: int | None = None
+        self.__latest: T | None = None
+
+    @abstractmethod
+    async def _version(self) -> int:
+        """
+        Get the current version of the topic.
+        Called every time the topic may have changed, regardless
+        of the number of subscribers, so it should be as cheap as possible.
+
+        :return: Version of the topic
+        :rtype: int
+        """
+        ...
+
+    @abstractmethod
+    async def _fetch(self, version: int) -> T:
+        """
+        Fetch the payload of the topic.
+        Called only when the version has changed.
+
+        :param version: Version the payload is fetched for
+        :type version: int
+        :return: Payload to send to every subscriber
+        :rtype: T
+        """
+        ...
+
+    async def _changes(self) -> AsyncIterator[int | None]:
+        """
+        Wait for changes of the topic.
+        By default the topic is polled every interval.
+
+        :return: New version of the topic, if known, every time it may have changed
+        :rtype: AsyncIterator[int | None]
+        """
+        while True:
+            yield None
+            await asyncio.sleep(self._interval)
+
+    def subscribe(self) -> asyncio.Queue[T]:
+        # subscribers only need the most recent state,
+        # so a single slot is enough and slow consumers
+        # never make the queue grow
+        queue: asyncio.Queue[T] = asyncio.Queue(maxsize=1)
+        if self.__latest is not None:
+            queue.put_nowait(self.__latest)
+        self.__subscribers.add(queue)
+
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.create_task(self.__run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[T]) -> None:
+        self.__subscribers.discard(queue)
+        if self.__subscribers or self.__task is None:
+            return
+
+        # nobody is listening, stop polling until the next subscriber
+        self.__task.cancel()
+        self.__task = None
+        self.__version = None
+        self.__latest = None
+
+    async def __run(self) -> None:
+        async for version in self._changes():
+            try:
+                if version is None:
+                    version = await self._version()
+                if version != self.__version:
+                    payload = await self._fetch(version)
+                    self.__version, self.__latest = version, payload
+                    self.__publish(payload)
+            except Exception as e:
+                logging.error(f"Error fetching payload in {self} - {str(e)}")
+
+    def __publish(self, payload: T) -> None:
+        for queue in self.__subscribers:
+            if queue.full():
+                # drop the stale payload, it is superseded by the new one
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+
+class RingBufferBroadcaster[T](
+    Broadcaster[dict[str, str]],
+    IResumableBroadcaster[dict[str, str]],
+):
+    def __init__(
+        self,
+        ring_buffer: IEncodedRingBuffer[T],
+        field: str,
+        interval: float,
+    ) -> None:
+        """
+        :param ring_buffer: Ring buffer to broadcast
+        :type ring_buffer: IEncodedRingBuffer[T]
+        :param field: Name of the field that holds buffer items in the payload
+        :type field: str
+        :param interval: Seconds between two reads of the buffer
+            when change notifications are unavailable
+        :type interval: float
+        """
+        super().__init__(interval)
+        self.__ring_buffer = ring_buffer
+        self.__field = field
+
+    async def _version(self) -> int:
+        return await self.__ring_buffer.version()
+
+    async def _changes(self) -> AsyncIterator[int | None]:
+        while True:
+            try:
+                async for version in self.__ring_buffer.subscribe():
+                    yield version
+            except Exception as e:
+                logging.error(f"Error subscribing to {self.__ring_buffer} - {str(e)}")
+
+            # notifications are unavailable, poll
+            # once before trying to subscribe again
+            yield None
+            await asyncio.sleep(self._interval)
+
+    async def _fetch(self, version: int) -> dict[str, str]:
+        # the buffer could have moved past the version,
+        # so the event is labeled with the one items were read at
+        version, encoded = await self.__ring_buffer.encoded(self.__field)
+        return {
+            "id": str(version),
+            "event": "message",
+            "data": encoded.decode(),
+        }
+
+    async def resume(self, cursor: int) -> dict[str, str] | None:
+        result = await self.__ring_buffer.since(cursor)
+        if result is None:
+            return None
+
+        version, items = result
+        return {
+            "id": str(version),
+            "event": "delta",
+            "data": json_dumps({self.__field: items}).decode(),
+        }
+
+
+class CounterBroadcaster(Broadcaster[dict[str, str]]):
+    def __init__(self, redis: Redis, key: str, interval: float) -> None:
+        """
+        :param redis: Redis client
+        :type redis: Redis
+        :param key: Key of the counter
+        :type key: str
+        :param interval: Seconds between two reads of the counter
+        :type interval: float
+        """
+        super().__init__(interval)
+        self.__redis = redis
+        self.__key = key
+
+    async def _version(self) -> int:
+        # the counter is its own version, it is not monotonic
+        # though, so it is not sent as an event id
+        count = await self.__redis.get(self.__key)
+        return max(int(count), 0) if count else 0
+
+    async def _fetch(self, version: int) -> dict[str, str]:
+        data = json_dumps({"count": version}).decode()
+        return {"event": "message", "data": data}
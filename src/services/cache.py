@@ -0,0 +1,171 @@
+import asyncio
+import logging
+import time
+from collections.abc import AsyncGenerator, Sequence
+
+from services.interfaces import IEncodedRingBuffer, IRingBuffer
+from services.serializers import json_dumps
+
+
+class CachedRingBuffer[T](IEncodedRingBuffer[T]):
+    def __init__(
+        self,
+        ring_buffer: IRingBuffer[T],
+        retry_seconds: float = 5,
+        ttl: float | None = None,
+    ) -> None:
+        """
+        Keeps decoded items of the buffer in process memory,
+        so they are read and decoded once per change.
+
+        Cache is revalidated with a single version read,
+        or not at all while change notifications are received.
+
+        :param ring_buffer: Buffer to cache
+        :type ring_buffer: IRingBuffer[T]
+        :param retry_seconds: Seconds to wait before subscribing
+            to change notifications again after a failure
+        :type retry_seconds: float
+        :param ttl: Seconds items are cached for at most, so items
+            expiring in the buffer without a change leave the cache too
+        :type ttl: float | None
+        """
+        self.__ring_buffer = ring_buffer
+        self.__retry_seconds = retry_seconds
+        self.__ttl = ttl
+        self.__version: int | None = None
+        self.__items: list[T] = []
+        self.__read_at = 0.0
+        self.__encoded_version: int | None = None
+        self.__encoded: dict[str, bytes] = {}
+        self.__notified: int | None = None
+        self.__subscriptions = 0
+        self.__lock = asyncio.Lock()
+        self.__listener: asyncio.Task[None] | None = None
+        self.__listener_failed_at = 0.0
+
+    def __listen(self) -> None:
+        if self.__listener is not None and not self.__listener.done():
+            return
+        if time.monotonic() - self.__listener_failed_at < self.__retry_seconds:
+            return
+        self.__listener = asyncio.create_task(self.__consume())
+
+    async def __consume(self) -> None:
+        try:
+            async for _ in self.subscribe():
+                pass
+        except Exception as e:
+            logging.error(f"Error subscribing to {self.__ring_buffer} - {str(e)}")
+        self.__listener_failed_at = time.monotonic()
+
+    async def __current(self) -> int:
+        self.__listen()
+        if self.__notified is not None:
+            return self.__notified
+        return await self.__ring_buffer.version()
+
+    def __fresh(self, version: int) -> bool:
+        if version != self.__version:
+            return False
+        return self.__ttl is None or time.monotonic() - self.__read_at < self.__ttl
+
+    async def __cached(self) -> tuple[int, list[T]]:
+        version = await self.__current()
+        if self.__fresh(version):
+            return version, self.__items
+
+        async with self.__lock:
+            # concurrent callers wait for a single read of the buffer
+            if not self.__fresh(version):
+                self.__read_at = time.monotonic()
+                self.__version, self.__items = await self.__ring_buffer.snapshot()
+                # expired items leave without a change of the version
+                self.__encoded_version, self.__encoded = None, {}
+        return self.__version or 0, self.__items
+
+    def __invalidate(self) -> None:
+        self.__version, self.__items = None, []
+        self.__encoded_version, self.__encoded = None, {}
+
+    async def initialize(self) -> None:
+        await self.__ring_buffer.initialize()
+
+    def __written(self, version: int) -> int:
+        if self.__notified is not None:
+            # notification of the write arrives later, until then
+            # readers would get items from before the write
+            self.__notified = max(self.__notified, version)
+        return version
+
+    async def put(self, value: T) -> int:
+        self.__invalidate()
+        return self.__written(await self.__ring_buffer.put(value))
+
+    async def put_many(self, values: Sequence[T]) -> int:
+        self.__invalidate()
+        return self.__written(await self.__ring_buffer.put_many(values))
+
+    async def all(self) -> list[T]:
+        _, items = await self.__cached()
+        return items.copy()
+
+    async def snapshot(self) -> tuple[int, list[T]]:
+        version, items = await self.__cached()
+        return version, items.copy()
+
+    async def latest(self, n: int = 1) -> list[T]:
+        _, items = await self.__cached()
+        return items[::-1][:n] if n > 0 else []
+
+    async def encoded(self, field: str) -> tuple[int, bytes]:
+        version, items = await self.__cached()
+        if version != self.__encoded_version:
+            self.__encoded_version, self.__encoded = version, {}
+        if field not in self.__encoded:
+            # encoded once per version, requests and
+            # stream events share the same document
+            self.__encoded[field] = json_dumps({field: items})
+        return version, self.__encoded[field]
+
+    async def since(self, cursor: int) -> tuple[int, list[T]] | None:
+        version, items = await self.__cached()
+        # items of buffers with a max age skip expired ones,
+        # so their versions are not consecutive
+        if self.__ttl is None and 0 <= version - cursor <= len(items):
+            start = len(items) - (version - cursor)
+            return version, items[start:]
+        return await self.__ring_buffer.since(cursor)
+
+    async def range(self, start_ts: float, end_ts: float) -> list[T]:
+        # timestamps are only known to the buffer
+        return await self.__ring_buffer.range(start_ts, end_ts)
+
+    async def version(self) -> int:
+        return await self.__current()
+
+    async def subscribe(self) -> AsyncGenerator[int]:
+        self.__subscriptions += 1
+        try:
+            async for version in self.__ring_buffer.subscribe():
+                # set before yielding, so subscribers reading
+                # the buffer on notification never get stale items
+                self.__notified = version
+                yield version
+        finally:
+            self.__subscriptions -= 1
+            if not self.__subscriptions:
+                # notifications are not received anymore
+                self.__notified = None
+
+    async def clear(self) -> bool:
+        self.__invalidate()
+        return await self.__ring_buffer.clear()
+
+    async def size(self) -> int:
+        _, items = await self.__cached()
+        return len(items)
+
+    async def stats(self) -> dict[str, int]:
+        # bytes are only known to the buffer
+        return await self.__ring_buffer.stats()
@@ -0,0 +1,80 @@
+import logging
+import time
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+
+from services.interfaces import IDeduplicator
+
+
+class RecentKeys(IDeduplicator):
+    def __init__(
+        self,
+        ttl: int,
+        max_size: int,
+        redis: Redis | None = None,
+        prefix: str = "recent",
+    ) -> None:
+        """
+        Remembers keys seen within ttl in process memory, evicting
+        the least recently seen ones over max_size.
+
+        Keys missing in memory are checked with SET NX EX in redis,
+        if given, so a key is first seen by one worker only.
+        Redis errors are logged and the key counts as not seen.
+
+        :param ttl: Seconds a key is remembered for
+        :type ttl: int
+        :param max_size: Maximum number of keys kept in memory
+        :type max_size: int
+        :param redis: Redis client to share keys between workers with
+        :type redis: Redis | None
+        :param prefix: Prefix of keys in redis
+        :type prefix: str
+        """
+        self.__ttl = ttl
+        self.__max_size = max_size
+        self.__redis = redis
+        self.__prefix = prefix
+        self.__expires: OrderedDict[str, float] = OrderedDict()
+
+    def __remember(self, key: str, expires: float) -> None:
+        self.__expires[key] = expires
+        self.__expires.move_to_end(key)
+        while len(self.__expires) > self.__max_size:
+            self.__expires.popitem(last=False)
+
+    async def first_seen(self, key: str) -> bool:
+        now = time.monotonic()
+        expires = self.__expires.get(key)
+        if expires is not None and expires > now:
+            self.__expires.move_to_end(key)
+            return False
+
+        # remembered before awaiting, so concurrent
+        # requests with the key do not report it twice
+        self.__remember(key, now + self.__ttl)
+        if self.__redis is None:
+            return True
+
+        try:
+            created = await self.__redis.set(
+                f"{self.__prefix}:{key}",
+                1,
+                nx=True,
+                ex=self.__ttl,
+            )
+        except Exception as e:
+            logging.error(f"Error checking {key} in {self} - {str(e)}")
+            return True
+        return bool(created)
+
+    async def forget(self, key: str) -> None:
+        self.__expires.pop(key, None)
+        if self.__redis is None:
+            return
+
+        try:
+            await self.__redis.delete(f"{self.__prefix}:{key}")
+        except Exception as e:
+            logging.error(f"Error forgetting {key} in {self} - {str(e)}")
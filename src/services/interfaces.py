@@ -1,15 +1,35 @@
+from collections.abc import AsyncIterator, Sequence
 from typing import Protocol
 
 
 class IRingBuffer[T](Protocol):
-    async def put(self, value: T) -> bool:
+    async def initialize(self) -> None:
+        """
+        Prepare the buffer for use, e.g. on application startup.
+        Other methods initialize the buffer on their own if needed.
+        """
+        ...
+
+    async def put(self, value: T) -> int:
         """
         Put a value to the ring buffer.
 
         :param value: Value to put
         :type value: T
-        :return: True if successfull, False otherwise
-        :rtype: bool
+        :return: Version of the buffer after the write
+        :rtype: int
+        """
+        ...
+
+    async def put_many(self, values: Sequence[T]) -> int:
+        """
+        Put several values to the ring buffer at once,
+        in the order they are given.
+
+        :param values: Values to put
+        :type values: Sequence[T]
+        :return: Version of the buffer after the write
+        :rtype: int
         """
         ...
 
@@ -23,6 +43,16 @@ class IRingBuffer[T](Protocol):
         """
         ...
 
+    async def snapshot(self) -> tuple[int, list[T]]:
+        """
+        Read the current version and all items from the buffer at once.
+        Returns items in the order they were written.
+
+        :return: Version and values in the buffer
+        :rtype: tuple[int, list[T]]
+        """
+        ...
+
     async def latest(self, n: int = 1) -> list[T]:
         """
         Read the n most recent items from the buffer.
@@ -35,6 +65,54 @@ class IRingBuffer[T](Protocol):
         """
         ...
 
+    async def since(self, cursor: int) -> tuple[int, list[T]] | None:
+        """
+        Read items written after the cursor.
+        Returns items in the order they were written.
+
+        :param cursor: Version of the buffer the caller has already seen
+        :type cursor: int
+        :return: Current version and items written after the cursor,
+            None if some of them were already evicted
+        :rtype: tuple[int, list[T]] | None
+        """
+        ...
+
+    async def range(self, start_ts: float, end_ts: float) -> list[T]:
+        """
+        Read items with timestamps in the range, both ends included.
+        Returns items in the order they were written.
+
+        :param start_ts: Unix timestamp to read items from
+        :type start_ts: float
+        :param end_ts: Unix timestamp to read items until
+        :type end_ts: float
+        :return: Values in the buffer within the range
+        :rtype: list[T]
+        """
+        ...
+
+    async def version(self) -> int:
+        """
+        Get the current version of the buffer.
+        Version grows with every put and is reset by clear.
+
+        :return: Current version
+        :rtype: int
+        """
+        ...
+
+    def subscribe(self) -> AsyncIterator[int]:
+        """
+        Subscribe to changes of the buffer.
+        Yields the current version once subscribed
+        and then a new version on every put or clear.
+
+        :return: Versions of the buffer
+        :rtype: AsyncIterator[int]
+        """
+        ...
+
     async def clear(self) -> bool:
         """
         Clear the buffer.
@@ -53,6 +131,16 @@ class IRingBuffer[T](Protocol):
         """
         ...
 
+    async def stats(self) -> dict[str, int]:
+        """
+        Get usage of the buffer: current version,
+        number of elements and bytes they take.
+
+        :return: Mapping with "version", "size" and "bytes" keys
+        :rtype: dict[str, int]
+        """
+        ...
+
 
 class ISerializer[T](Protocol):
     def dumps(self, obj: T) -> bytes | str:
@@ -78,6 +166,169 @@ class ISerializer[T](Protocol):
         ...
 
 
+# protocols above are compared with f-locations/src/interfaces.py
+# line by line, so imports used by the web app only come after them
+import asyncio  # noqa: E402
+
+
+class IEncodedRingBuffer[T](IRingBuffer[T], Protocol):
+    async def encoded(self, field: str) -> tuple[int, bytes]:
+        """
+        Get all elements encoded as a JSON document,
+        e.g. {"<field>": [...]}, ready to be sent as is.
+
+        :param field: Name of the field that holds elements in the document
+        :type field: str
+        :return: Version and the document for this version
+        :rtype: tuple[int, bytes]
+        """
+        ...
+
+
+class IBroadcaster[T](Protocol):
+    def subscribe(self) -> asyncio.Queue[T]:
+        """
+        Subscribe to the topic.
+        The queue always holds the most recent payload only.
+
+        :return: Queue receiving payloads of the topic
+        :rtype: asyncio.Queue[T]
+        """
+        ...
+
+    def unsubscribe(self, queue: asyncio.Queue[T]) -> None:
+        """
+        Unsubscribe from the topic.
+
+        :param queue: Queue returned by subscribe
+        :type queue: asyncio.Queue[T]
+        """
+        ...
+
+
+class IResumableBroadcaster[T](IBroadcaster[T], Protocol):
+    async def resume(self, cursor: int) -> T | None:
+        """
+        Build a payload bringing a subscriber that has seen
+        the cursor up to date with the topic.
+
+        :param cursor: Version of the topic the subscriber has seen
+        :type cursor: int
+        :return: Payload with changes made after the cursor,
+            None if the subscriber needs a full payload instead
+        :rtype: T | None
+        """
+        ...
+
+
+class IPresence(Protocol):
+    def join(self) -> None:
+        """
+        Count a new connection to this instance.
+        """
+        ...
+
+    def leave(self) -> None:
+        """
+        Stop counting a connection to this instance.
+        """
+        ...
+
+    async def start(self) -> None:
+        """
+        Start publishing connections of this instance,
+        so they are counted by every instance.
+        """
+        ...
+
+    async def stop(self) -> None:
+        """
+        Stop publishing connections of this instance
+        and remove them from the count.
+        """
+        ...
+
+
+class IUniqueVisitors(Protocol):
+    def record(self, ip: str) -> None:
+        """
+        Record a visit, without waiting for it to be stored.
+
+        :param ip: IP address of the visitor
+        :type ip: str
+        """
+        ...
+
+    async def flush(self) -> None:
+        """
+        Store visits recorded so far.
+        """
+        ...
+
+    async def count(self, days: int) -> int:
+        """
+        Count unique visitors approximately.
+
+        :param days: Number of days to count visitors for, including today
+        :type days: int
+        :return: Approximate number of unique visitors
+        :rtype: int
+        """
+        ...
+
+
+class IEventPublisher[T](Protocol):
+    def publish(self, event: T) -> bool:
+        """
+        Publish an event, without waiting for it to be delivered.
+
+        :param event: Event to publish
+        :type event: T
+        :return: True if the event is accepted, False if it is dropped
+        :rtype: bool
+        """
+        ...
+
+    async def stop(self) -> None:
+        """
+        Deliver accepted events and stop publishing, e.g. on shutdown.
+        """
+        ...
+
+    def stats(self) -> dict[str, int]:
+        """
+        Get counters of the publisher, e.g. events waiting
+        to be delivered and events dropped so far.
+
+        :return: Counters by name
+        :rtype: dict[str, int]
+        """
+        ...
+
+
+class IDeduplicator(Protocol):
+    async def first_seen(self, key: str) -> bool:
+        """
+        Check if the key is seen for the first time recently and remember it.
+
+        :param key: Key to check
+        :type key: str
+        :return: True if the key was not seen recently, False otherwise
+        :rtype: bool
+        """
+        ...
+
+    async def forget(self, key: str) -> None:
+        """
+        Forget the key, so it is seen for the first time again,
+        e.g. when the work done for it could not be completed.
+
+        :param key: Key to forget
+        :type key: str
+        """
+        ...
+
+
 class IHashAndCompare(Protocol):
     def __call__(self, value: bytes | str, expected: str, key: str = ...) -> str:
         """
@@ -0,0 +1,7 @@
+from datetime import datetime
+
+from schemas.locations import IPEvent
+
+
+def ip_event(ip: str) -> IPEvent:
+    return IPEvent(ip=ip, timestamp=str(datetime.now().timestamp()))
@@ -0,0 +1,172 @@
+import asyncio
+import time
+from collections.abc import AsyncGenerator, Callable, Sequence
+from typing import cast
+
+from services.interfaces import IRingBuffer
+
+
+class InMemoryRingBuffer[T](IRingBuffer[T]):
+    def __init__(
+        self,
+        max_size: int,
+        timestamp: Callable[[T], float] | None = None,
+        max_age: float | None = None,
+    ) -> None:
+        """
+        Keeps items in process memory, in a list preallocated for
+        max_size items and indexed by version modulo max_size.
+
+        Items are stored and returned as is, without serialization,
+        and are not shared between processes. Every operation completes
+        without awaiting, so it is atomic for coroutines of the event loop.
+        Items are not serialized, so their size in bytes is not tracked.
+
+        :param max_size: Maximum number of elements
+        :type max_size: int
+        :param timestamp: Function returning the timestamp to look
+            an item up by, time of the write by default
+        :type timestamp: Callable[[T], float] | None
+        :param max_age: Maximum age of elements in seconds, by their
+            timestamps, older ones are skipped on read and evicted on
+            write once they are the oldest ones
+        :type max_age: float | None
+        """
+        self.__max_size = max_size
+        self.__items: list[T | None] = [None] * max_size
+        self.__timestamps = [0.0] * max_size
+        self.__timestamp = timestamp
+        self.__max_age = max_age
+        self.__head = 0
+        self.__tail = 0
+        self.__changes = 0
+        self.__changed = asyncio.Event()
+
+    def __notify(self) -> None:
+        self.__changes += 1
+        # wake up current subscribers, later ones wait for the next change
+        self.__changed.set()
+        self.__changed = asyncio.Event()
+
+    def __live(self, start: int, stop: int) -> list[int]:
+        # items older than max_age are skipped even if nothing evicted
+        # them yet, timestamps are not ordered, so every item is checked
+        expires = self.__expires()
+        return [
+            i
+            for i in range(start, stop)
+            if self.__timestamps[i % self.__max_size] >= expires
+        ]
+
+    def __read(self, positions: Sequence[int]) -> list[T]:
+        # slots of live items are always filled
+        items = cast(list[T], self.__items)
+        return [items[i % self.__max_size] for i in positions]
+
+    def __expires(self) -> float:
+        if self.__max_age is None:
+            return float("-inf")
+        return time.time() - self.__max_age
+
+    def __oldest(self) -> int:
+        return max(self.__tail, self.__head - self.__max_size)
+
+    def __evict(self) -> None:
+        # overwritten slots already hold newer items, expired
+        # ones are released while they are the oldest
+        self.__tail = self.__oldest()
+        expires = self.__expires()
+        while self.__tail < self.__head:
+            if self.__timestamps[self.__tail % self.__max_size] >= expires:
+                break
+            self.__items[self.__tail % self.__max_size] = None
+            self.__tail += 1
+
+    async def initialize(self) -> None:
+        return
+
+    def __timestamp_of(self, value: T) -> float:
+        if self.__timestamp is None:
+            return time.time()
+        return self.__timestamp(value)
+
+    async def put(self, value: T) -> int:
+        self.__items[self.__head % self.__max_size] = value
+        self.__timestamps[self.__head % self.__max_size] = self.__timestamp_of(value)
+        self.__head += 1
+        self.__evict()
+        self.__notify()
+        return self.__head
+
+    async def put_many(self, values: Sequence[T]) -> int:
+        if not values:
+            return self.__head
+
+        # values overwritten within the same batch are never stored
+        skipped = max(len(values) - self.__max_size, 0)
+        for i, value in enumerate(values[skipped:], start=self.__head + skipped):
+            self.__items[i % self.__max_size] = value
+            self.__timestamps[i % self.__max_size] = self.__timestamp_of(value)
+        self.__head += len(values)
+        self.__evict()
+        self.__notify()
+        return self.__head
+
+    async def all(self) -> list[T]:
+        _, items = await self.snapshot()
+        return items
+
+    async def snapshot(self) -> tuple[int, list[T]]:
+        return self.__head, self.__read(self.__live(self.__oldest(), self.__head))
+
+    async def latest(self, n: int = 1) -> list[T]:
+        if n <= 0:
+            return []
+        live = self.__live(self.__oldest(), self.__head)
+        start = max(len(live) - n, 0)
+        return self.__read(live[start:])[::-1]
+
+    async def since(self, cursor: int) -> tuple[int, list[T]] | None:
+        if cursor < self.__oldest() or cursor > self.__head:
+            return None
+        return self.__head, self.__read(self.__live(cursor, self.__head))
+
+    async def range(self, start_ts: float, end_ts: float) -> list[T]:
+        # a scan of every slot, timestamps are not ordered
+        start = self.__oldest()
+        start_ts = max(start_ts, self.__expires())
+        items = cast(list[T], self.__items)
+        return [
+            items[i % self.__max_size]
+            for i in range(start, self.__head)
+            if start_ts <= self.__timestamps[i % self.__max_size] <= end_ts
+        ]
+
+    async def version(self) -> int:
+        return self.__head
+
+    async def subscribe(self) -> AsyncGenerator[int]:
+        seen = self.__changes
+        yield self.__head
+
+        while True:
+            if seen == self.__changes:
+                await self.__changed.wait()
+            # changes made while the subscriber was busy
+            # are coalesced into the most recent version
+            seen = self.__changes
+            yield self.__head
+
+    async def clear(self) -> bool:
+        self.__items = [None] * self.__max_size
+        self.__timestamps = [0.0] * self.__max_size
+        self.__head = 0
+        self.__tail = 0
+        self.__notify()
+        return True
+
+    async def size(self) -> int:
+        return len(self.__live(self.__oldest(), self.__head))
+
+    async def stats(self) -> dict[str, int]:
+        return {"version": self.__head, "size": await self.size(), "bytes": 0}
@@ -0,0 +1,236 @@
+import asyncio
+import contextlib
+import logging
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, TypeAlias
+
+from pydantic import BaseModel
+from redis.asyncio import Redis
+
+if TYPE_CHECKING:
+    from types_boto3_sqs.service_resource import Queue
+else:
+    Queue: TypeAlias = Any
+
+from services.interfaces import IEventPublisher
+
+# SendMessageBatch accepts at most 10 messages
+SQS_BATCH_SIZE = 10
+
+
+class BatchPublisher[T: BaseModel](IEventPublisher[T], ABC):
+    def __init__(
+        self,
+        max_size: int,
+        batch_size: int,
+        batch_seconds: float,
+    ) -> None:
+        """
+        Publishes events from a background task, so requests
+        only put events to a bounded in-process queue and never wait
+        for the transport. Events are sent in batches of up to
+        batch_size, once a batch is full or batch_seconds after
+        its first event.
+
+        Events are dropped while the queue is full.
+
+        :param max_size: Maximum number of events waiting to be sent
+        :type max_size: int
+        :param batch_size: Maximum number of events sent at once
+        :type batch_size: int
+        :param batch_seconds: Seconds to wait for a batch to fill up
+        :type batch_seconds: float
+        """
+        self.__max_size = max_size
+        self.__batch_size = batch_size
+        self.__batch_seconds = batch_seconds
+        self.__events: asyncio.Queue[T] = asyncio.Queue(maxsize=max_size)
+        self.__batch: list[T] = []
+        self.__task: asyncio.Task[None] | None = None
+        self.__sending: asyncio.Task[None] | None = None
+        self.__overflowing = False
+        self.__published = 0
+        self.__dropped = 0
+        self.__failed = 0
+        self.__batches = 0
+
+    @abstractmethod
+    async def _send(self, batch: list[T]) -> int:
+        """
+        Send the batch of events.
+
+        :param batch: Events to send
+        :type batch: list[T]
+        :return: Number of events that were not sent
+        :rtype: int
+        """
+
+    def publish(self, event: T) -> bool:
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.create_task(self.__run())
+
+        try:
+            self.__events.put_nowait(event)
+        except asyncio.QueueFull:
+            self.__dropped += 1
+            if not self.__overflowing:
+                # logged once per overflow, not once per event
+                logging.warning(
+                    f"Queue of {self} is full, dropping events - {self.stats()}"
+                )
+            self.__overflowing = True
+            return False
+
+        self.__overflowing = False
+        return True
+
+    async def __run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self.__batch.append(await self.__events.get())
+            deadline = loop.time() + self.__batch_seconds
+            while len(self.__batch) < self.__batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    event = await asyncio.wait_for(self.__events.get(), timeout)
+                except TimeoutError:
+                    break
+                self.__batch.append(event)
+
+            batch, self.__batch = self.__batch, []
+            # shielded, so stopping the publisher
+            # never cancels a batch that is being sent
+            self.__sending = asyncio.create_task(self.__send(batch))
+            await asyncio.shield(self.__sending)
+
+    async def __send(self, batch: list[T]) -> None:
+        try:
+            failed = await self._send(batch)
+        except Exception as e:
+            logging.error(f"Error sending events in {self} - {str(e)}")
+            failed = len(batch)
+
+        self.__batches += 1
+        self.__published += len(batch) - failed
+        self.__failed += failed
+
+    async def stop(self) -> None:
+        if self.__task is not None:
+            self.__task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.__task
+            self.__task = None
+        if self.__sending is not None:
+            await self.__sending
+
+        # events gathered into a batch or still
+        # waiting in the queue are sent right away
+        remaining, self.__batch = self.__batch, []
+        while not self.__events.empty():
+            remaining.append(self.__events.get_nowait())
+        for start in range(0, len(remaining), self.__batch_size):
+            end = start + self.__batch_size
+            await self.__send(remaining[start:end])
+
+        logging.info(f"Stopped {self} - {self.stats()}")
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self.__events.qsize(),
+            "capacity": self.__max_size,
+            "published": self.__published,
+            "dropped": self.__dropped,
+            "failed": self.__failed,
+            "batches": self.__batches,
+        }
+
+
+class SQSBatchPublisher[T: BaseModel](BatchPublisher[T]):
+    def __init__(
+        self,
+        queue: Queue,
+        max_size: int,
+        batch_seconds: float,
+        group_id: str = "default",
+    ) -> None:
+        """
+        Publishes events to SQS in batches of up to 10,
+        boto3 calls run in the default executor, off the event loop.
+
+        :param queue: SQS queue
+        :type queue: Queue
+        :param max_size: Maximum number of events waiting to be sent
+        :type max_size: int
+        :param batch_seconds: Seconds to wait for a batch to fill up
+        :type batch_seconds: float
+        :param group_id: Message group of events in a FIFO queue
+        :type group_id: str
+        """
+        super().__init__(max_size, SQS_BATCH_SIZE, batch_seconds)
+        self.__queue = queue
+        self.__group_id = group_id
+
+    async def _send(self, batch: list[T]) -> int:
+        entries = [
+            {
+                "Id": str(i),
+                "MessageBody": event.model_dump_json(),
+                "MessageGroupId": self.__group_id,
+            }
+            for i, event in enumerate(batch)
+        ]
+        response = await asyncio.to_thread(
+            self.__queue.send_messages,
+            Entries=entries,  # type:ignore[arg-type]
+        )
+        return len(response.get("Failed", []))
+
+
+class RedisStreamPublisher[T: BaseModel](BatchPublisher[T]):
+    def __init__(
+        self,
+        redis: Redis,
+        stream: str,
+        max_size: int,
+        batch_size: int,
+        batch_seconds: float,
+        max_len: int,
+    ) -> None:
+        """
+        Publishes events to a redis stream, a batch is added
+        in one pipeline. Consumers read the stream in a consumer group.
+
+        The stream is trimmed to about max_len entries,
+        so events are lost if consumers fall that far behind.
+
+        :param redis: Redis client
+        :type redis: Redis
+        :param stream: Name of the stream
+        :type stream: str
+        :param max_size: Maximum number of events waiting to be sent
+        :type max_size: int
+        :param batch_size: Maximum number of events sent at once
+        :type batch_size: int
+        :param batch_seconds: Seconds to wait for a batch to fill up
+        :type batch_seconds: float
+        :param max_len: Approximate maximum length of the stream
+        :type max_len: int
+        """
+        super().__init__(max_size, batch_size, batch_seconds)
+        self.__redis = redis
+        self.__stream = stream
+        self.__max_len = max_len
+
+    async def _send(self, batch: list[T]) -> int:
+        pipe = self.__redis.pipeline(transaction=False)
+        for event in batch:
+            await pipe.xadd(
+                self.__stream,
+                {"body": event.model_dump_json()},
+                maxlen=self.__max_len,
+                approximate=True,
+            )
+        ids = await pipe.execute()
+        return sum(1 for id in ids if id is None)
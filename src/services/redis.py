@@ -1,18 +1,104 @@
 import pickle
+import time
+from collections.abc import AsyncGenerator, Callable, Sequence
+from pathlib import Path
+from typing import Any
 
-import aiofiles
 from redis.asyncio import Redis
 from redis.commands.core import AsyncScript
 
 from services.interfaces import IRingBuffer, ISerializer
 
+# scripts are read once on import, relative to the package
+# rather than the working directory
+LUA_PATH = Path(__file__).resolve().parent.parent / "lua"
+SCRIPTS = {
+    path.relative_to(LUA_PATH).as_posix(): path.read_text()
+    for path in LUA_PATH.glob("*/*.lua")
+}
+
+
+async def _prepare(redis: Redis, head_key: str, scripts: list[AsyncScript]) -> None:
+    pipe = redis.pipeline(transaction=False)
+    await pipe.set(head_key, 0, nx=True)
+    for script in scripts:
+        await pipe.script_load(script.script)
+    await pipe.execute()
+
+
+async def _stats(
+    redis: Redis,
+    head_key: str,
+    tail_key: str,
+    bytes_key: str,
+    max_size: int,
+) -> dict[str, int]:
+    pipe = redis.pipeline(transaction=True)
+    await pipe.get(head_key)
+    await pipe.get(tail_key)
+    await pipe.get(bytes_key)
+    head, tail, used = (int(value) if value else 0 for value in await pipe.execute())
+    return {
+        "version": head,
+        "size": head - max(tail, head - max_size),
+        "bytes": used,
+    }
+
+
+def _alive(head: int, oldest: int, live: list[int] | None) -> range | set[int]:
+    # sequence numbers of values to read, all of them if values do not expire
+    if live is None:
+        return range(oldest, head)
+    return {int(sequence) for sequence in live}
+
+
+async def _unindexed(
+    redis: Redis,
+    head_key: str,
+    tail_key: str,
+    index_key: str,
+    max_size: int,
+) -> range:
+    pipe = redis.pipeline(transaction=True)
+    await pipe.get(head_key)
+    await pipe.get(tail_key)
+    await pipe.zcard(index_key)
+    head, tail, indexed = (int(value) if value else 0 for value in await pipe.execute())
+    oldest = max(tail, head - max_size)
+    # every value is indexed, nothing to read
+    if indexed >= head - oldest:
+        return range(0)
+    return range(oldest, head)
+
+
+async def _backfill(
+    redis: Redis,
+    script: AsyncScript,
+    head_key: str,
+    tail_key: str,
+    index_key: str,
+    max_size: int,
+    timestamps: dict[int, float],
+) -> None:
+    members = [str(sequence) for sequence in timestamps]
+    scores = await redis.zmscore(index_key, members) if members else []
+    args: list[float] = []
+    for sequence, score in zip(timestamps, scores):
+        if score is None:
+            args += [sequence, timestamps[sequence]]
+    if args:
+        await script(keys=[head_key, tail_key, index_key], args=[max_size, *args])
+
 
 class RedisRingBuffer[T](IRingBuffer[T]):
-    __write: AsyncScript
+    __write_many: AsyncScript
+    __range: AsyncScript
     __size: AsyncScript
     __clear: AsyncScript
     __latest: AsyncScript
-    __all_ordered: AsyncScript
+    __snapshot: AsyncScript
+    __since: AsyncScript
+    __backfill: AsyncScript
 
     def __init__(
         self,
@@ -20,6 +106,9 @@ class RedisRingBuffer[T](IRingBuffer[T]):
         name: str,
         max_size: int,
         serializer: ISerializer[T] = pickle,  # type:ignore[assignment]
+        timestamp: Callable[[T], float] | None = None,
+        max_bytes: int | None = None,
+        max_age: float | None = None,
     ):
         """
         :param redis: Redis client
@@ -30,108 +119,947 @@ class RedisRingBuffer[T](IRingBuffer[T]):
         :type max_size: int
         :param serializer: Serializer for redis
         :type serializer: ISerializer[T]
+        :param timestamp: Function returning the timestamp to index
+            an item by, time of the write by default
+        :type timestamp: Callable[[T], float] | None
+        :param max_bytes: Maximum total size of serialized elements,
+            oldest ones are evicted on write to stay within it
+        :type max_bytes: int | None
+        :param max_age: Maximum age of elements in seconds, by their
+            timestamps, older ones are skipped on read and evicted on
+            write once they are the oldest ones
+        :type max_age: float | None
         """
         self.__redis = redis
         self.__name = name
         self.__max_size = max_size
         self.__serializer = serializer
+        self.__timestamp = timestamp
+        self.__max_bytes = max_bytes
+        self.__max_age = max_age
         self.__head_key = f"{name}:head"
         self.__data_key = f"{name}:data"
         self.__lock_key = f"{name}:lock"
+        self.__channel_key = f"{name}:changes"
+        self.__index_key = f"{name}:index"
+        self.__tail_key = f"{name}:tail"
+        self.__bytes_key = f"{name}:bytes"
         self.__initialized = False
 
-    async def _initialize(self) -> None:
+    async def initialize(self) -> None:
         if self.__initialized:
             return
 
-        if not await self.__redis.exists(self.__head_key):
-            await self.__redis.set(self.__head_key, 0)
+        self.__write_many = self.__redis.register_script(SCRIPTS["hset/write_many.lua"])
+        self.__range = self.__redis.register_script(SCRIPTS["hset/range.lua"])
+        self.__size = self.__redis.register_script(SCRIPTS["hset/size.lua"])
+        self.__clear = self.__redis.register_script(SCRIPTS["hset/clear.lua"])
+        self.__latest = self.__redis.register_script(SCRIPTS["hset/latest.lua"])
+        self.__snapshot = self.__redis.register_script(SCRIPTS["hset/snapshot.lua"])
+        self.__since = self.__redis.register_script(SCRIPTS["hset/since.lua"])
+        self.__backfill = self.__redis.register_script(SCRIPTS["index/backfill.lua"])
+
+        # one round trip creates the head and caches every script,
+        # scripts are loaded again on NOSCRIPT after a redis restart
+        await _prepare(
+            self.__redis,
+            self.__head_key,
+            [
+                self.__write_many,
+                self.__range,
+                self.__size,
+                self.__clear,
+                self.__latest,
+                self.__snapshot,
+                self.__since,
+                self.__backfill,
+            ],
+        )
+        await self.__index()
+
+        self.__initialized = True
 
-        async def load(path: str) -> str:
-            async with aiofiles.open(path, "r") as file:
-                content = await file.read()
-            return content
+    async def __index(self) -> None:
+        # values written before the index existed are indexed by
+        # their timestamps, so they are not taken for expired ones
+        sequences = await _unindexed(
+            self.__redis,
+            self.__head_key,
+            self.__tail_key,
+            self.__index_key,
+            self.__max_size,
+        )
+        if not sequences:
+            return
 
-        self.__write = self.__redis.register_script(
-            await load("lua/hset/write_one.lua")
+        values = await self.__redis.hmget(  # type:ignore[misc]
+            self.__data_key,
+            [sequence % self.__max_size for sequence in sequences],
         )
-        self.__size = self.__redis.register_script(await load("lua/hset/size.lua"))
-        self.__clear = self.__redis.register_script(await load("lua/hset/clear.lua"))
-        self.__latest = self.__redis.register_script(await load("lua/hset/latest.lua"))
-        self.__all_ordered = self.__redis.register_script(
-            await load("lua/hset/all.lua")
+        await self.__fill(
+            {
+                sequence: self.__timestamp_of(self.__serializer.loads(value))
+                for sequence, value in zip(sequences, values)
+                if value is not None
+            }
         )
 
-        self.__initialized = True
+    async def __fill(self, timestamps: dict[int, float]) -> None:
+        await _backfill(
+            self.__redis,
+            self.__backfill,
+            self.__head_key,
+            self.__tail_key,
+            self.__index_key,
+            self.__max_size,
+            timestamps,
+        )
 
     async def _head(self) -> int:
         head = await self.__redis.get(self.__head_key)
         return int(head) if head else 0
 
-    async def put(self, value: T) -> bool:
-        await self._initialize()
+    def __timestamp_of(self, value: T) -> float:
+        if self.__timestamp is None:
+            return time.time()
+        return self.__timestamp(value)
+
+    async def put(self, value: T) -> int:
+        # a single value goes through the same script,
+        # so eviction is implemented in one place
+        return await self.put_many([value])
 
-        serialized = self.__serializer.dumps(value)
+    async def put_many(self, values: Sequence[T]) -> int:
+        await self.initialize()
 
-        await self.__write(
-            keys=[self.__head_key, self.__data_key],
-            args=[self.__max_size, serialized],
+        if not values:
+            return await self._head()
+
+        serialized = [self.__serializer.dumps(value) for value in values]
+        timestamps = [self.__timestamp_of(value) for value in values]
+
+        head = await self.__write_many(
+            keys=[
+                self.__head_key,
+                self.__data_key,
+                self.__channel_key,
+                self.__index_key,
+                self.__tail_key,
+                self.__bytes_key,
+            ],
+            args=[
+                self.__max_size,
+                self.__max_bytes or 0,
+                self.__max_age or 0,
+                time.time(),
+                *serialized,
+                *timestamps,
+            ],
         )
-        return True
+        return int(head)
 
     async def all(self) -> list[T]:
-        await self._initialize()
+        _, items = await self.snapshot()
+        return items
 
-        head = await self._head()
-        if head == 0:
-            return []
+    async def snapshot(self) -> tuple[int, list[T]]:
+        await self.initialize()
 
-        if head > self.__max_size:
-            # buffer has wrapped around, so
-            # we need to get items in the correct order
-            pairs = await self.__all_ordered(
-                keys=[self.__head_key, self.__data_key],
-                args=[self.__max_size],
-            )
-            return list(self.__serializer.loads(value) for _, value in pairs)
-        else:
-            # buffer has not wrapped around,
-            # so we can simply get all values and
-            # sort them
-            values = await self.__redis.hgetall(self.__data_key)  # type:ignore[misc]
-            positions: list[int] = [
-                int(key.decode()) if isinstance(key, bytes) else int(key)
-                for key in values.keys()
-            ]
-            positions = sorted(positions)
-            return list(
-                self.__serializer.loads(values[str(position).encode()])
-                for position in positions
-            )
+        # single script reads head and items, so
+        # a concurrent put can not tear the view
+        head, values = await self.__snapshot(
+            keys=[
+                self.__head_key,
+                self.__data_key,
+                self.__tail_key,
+                self.__index_key,
+            ],
+            args=[self.__max_size, self.__max_age or 0, time.time()],
+        )
+        return int(head), list(self.__serializer.loads(value) for value in values)
 
     async def latest(self, n: int = 1) -> list[T]:
-        await self._initialize()
+        await self.initialize()
 
         values = await self.__latest(
-            keys=[self.__head_key, self.__data_key],
-            args=[self.__max_size, n],
+            keys=[
+                self.__head_key,
+                self.__data_key,
+                self.__tail_key,
+                self.__index_key,
+            ],
+            args=[self.__max_size, n, self.__max_age or 0, time.time()],
         )
         return list(self.__serializer.loads(value) for value in values)
 
+    async def since(self, cursor: int) -> tuple[int, list[T]] | None:
+        await self.initialize()
+
+        if cursor < 0:
+            return None
+
+        head, values = await self.__since(
+            keys=[
+                self.__head_key,
+                self.__data_key,
+                self.__tail_key,
+                self.__index_key,
+            ],
+            args=[self.__max_size, cursor, self.__max_age or 0, time.time()],
+        )
+        if values is None:
+            return None
+        return int(head), list(self.__serializer.loads(value) for value in values)
+
+    async def range(self, start_ts: float, end_ts: float) -> list[T]:
+        await self.initialize()
+
+        values = await self.__range(
+            keys=[
+                self.__head_key,
+                self.__data_key,
+                self.__index_key,
+                self.__tail_key,
+            ],
+            args=[
+                self.__max_size,
+                start_ts,
+                end_ts,
+                self.__max_age or 0,
+                time.time(),
+            ],
+        )
+        return list(self.__serializer.loads(value) for value in values)
+
+    async def version(self) -> int:
+        await self.initialize()
+
+        return await self._head()
+
+    async def subscribe(self) -> AsyncGenerator[int]:
+        await self.initialize()
+
+        pubsub = self.__redis.pubsub()
+        await pubsub.subscribe(self.__channel_key)
+        try:
+            # subscription is established, so changes made
+            # after reading the head are not missed
+            yield await self._head()
+
+            while True:
+                # poll the socket with a timeout, blocking read
+                # would fail on the client's socket timeout
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=1.0,
+                )
+                if message is not None:
+                    yield int(message["data"])
+        finally:
+            await pubsub.aclose()  # type:ignore[no-untyped-call]
+
     async def clear(self) -> bool:
-        await self._initialize()
+        await self.initialize()
 
         await self.__clear(
-            keys=[self.__head_key, self.__data_key],
+            keys=[
+                self.__head_key,
+                self.__data_key,
+                self.__channel_key,
+                self.__index_key,
+                self.__tail_key,
+                self.__bytes_key,
+            ],
             args=[],
         )
         return True
 
     async def size(self) -> int:
-        await self._initialize()
+        await self.initialize()
 
         size = await self.__size(
-            keys=[self.__head_key],
-            args=[self.__max_size],
+            keys=[self.__head_key, self.__tail_key, self.__index_key],
+            args=[self.__max_size, self.__max_age or 0, time.time()],
         )
         return int(size) if size else 0
+
+    async def stats(self) -> dict[str, int]:
+        await self.initialize()
+
+        return await _stats(
+            self.__redis,
+            self.__head_key,
+            self.__tail_key,
+            self.__bytes_key,
+            self.__max_size,
+        )
+
+
+class RedisListRingBuffer[T](IRingBuffer[T]):
+    __write_many: AsyncScript
+    __range: AsyncScript
+    __live: AsyncScript
+    __backfill: AsyncScript
+    __since: AsyncScript
+
+    def __init__(
+        self,
+        redis: Redis,
+        name: str,
+        max_size: int,
+        serializer: ISerializer[T] = pickle,  # type:ignore[assignment]
+        timestamp: Callable[[T], float] | None = None,
+        max_bytes: int | None = None,
+        max_age: float | None = None,
+    ):
+        """
+        Keeps items in a capped list, newest first,
+        so reads are a single LRANGE with no wrap-around.
+
+        :param redis: Redis client
+        :type redis: Redis
+        :param name: Unique name for the buffer
+        :type name: str
+        :param max_size: Maximum number of elements
+        :type max_size: int
+        :param serializer: Serializer for redis
+        :type serializer: ISerializer[T]
+        :param timestamp: Function returning the timestamp to index
+            an item by, time of the write by default
+        :type timestamp: Callable[[T], float] | None
+        :param max_bytes: Maximum total size of serialized elements,
+            oldest ones are evicted on write to stay within it
+        :type max_bytes: int | None
+        :param max_age: Maximum age of elements in seconds, by their
+            timestamps, older ones are skipped on read and evicted on
+            write once they are the oldest ones
+        :type max_age: float | None
+        """
+        self.__redis = redis
+        self.__name = name
+        self.__max_size = max_size
+        self.__serializer = serializer
+        self.__timestamp = timestamp
+        self.__max_bytes = max_bytes
+        self.__max_age = max_age
+        self.__head_key = f"{name}:head"
+        self.__list_key = f"{name}:list"
+        self.__channel_key = f"{name}:changes"
+        self.__index_key = f"{name}:index"
+        self.__tail_key = f"{name}:tail"
+        self.__bytes_key = f"{name}:bytes"
+        self.__initialized = False
+
+    async def initialize(self) -> None:
+        if self.__initialized:
+            return
+
+        self.__write_many = self.__redis.register_script(SCRIPTS["list/write_many.lua"])
+        self.__range = self.__redis.register_script(SCRIPTS["list/range.lua"])
+        self.__live = self.__redis.register_script(SCRIPTS["list/live.lua"])
+        self.__backfill = self.__redis.register_script(SCRIPTS["index/backfill.lua"])
+        self.__since = self.__redis.register_script(SCRIPTS["list/since.lua"])
+
+        # one round trip creates the head and caches every script,
+        # scripts are loaded again on NOSCRIPT after a redis restart
+        await _prepare(
+            self.__redis,
+            self.__head_key,
+            [
+                self.__write_many,
+                self.__range,
+                self.__live,
+                self.__since,
+                self.__backfill,
+            ],
+        )
+        await self.__index()
+
+        self.__initialized = True
+
+    async def __index(self) -> None:
+        # values written before the index existed are indexed by
+        # their timestamps, so they are not taken for expired ones
+        sequences = await _unindexed(
+            self.__redis,
+            self.__head_key,
+            self.__tail_key,
+            self.__index_key,
+            self.__max_size,
+        )
+        if not sequences:
+            return
+
+        # values are newest first, value at index i has sequence head - 1 - i
+        values = await self.__redis.lrange(  # type:ignore[misc]
+            self.__list_key, 0, len(sequences) - 1
+        )
+        head = sequences.stop
+        await self.__fill(
+            {
+                head - 1 - i: self.__timestamp_of(self.__serializer.loads(value))
+                for i, value in enumerate(values)
+            }
+        )
+
+    async def __fill(self, timestamps: dict[int, float]) -> None:
+        await _backfill(
+            self.__redis,
+            self.__backfill,
+            self.__head_key,
+            self.__tail_key,
+            self.__index_key,
+            self.__max_size,
+            timestamps,
+        )
+
+    async def _head(self) -> int:
+        head = await self.__redis.get(self.__head_key)
+        return int(head) if head else 0
+
+    async def __bounds(self, client: Redis) -> list[Any]:
+        # head, the oldest value still in the list and values not expired,
+        # queued on the client if it is a pipeline
+        return await self.__live(  # type:ignore[no-any-return]
+            keys=[self.__head_key, self.__tail_key, self.__index_key],
+            args=[self.__max_size, self.__max_age or 0, time.time()],
+            client=client,
+        )
+
+    def __timestamp_of(self, value: T) -> float:
+        if self.__timestamp is None:
+            return time.time()
+        return self.__timestamp(value)
+
+    async def put(self, value: T) -> int:
+        # a single value goes through the same script,
+        # so eviction is implemented in one place
+        return await self.put_many([value])
+
+    async def put_many(self, values: Sequence[T]) -> int:
+        await self.initialize()
+
+        if not values:
+            return await self._head()
+
+        serialized = [self.__serializer.dumps(value) for value in values]
+        timestamps = [self.__timestamp_of(value) for value in values]
+
+        head = await self.__write_many(
+            keys=[
+                self.__head_key,
+                self.__list_key,
+                self.__channel_key,
+                self.__index_key,
+                self.__tail_key,
+                self.__bytes_key,
+            ],
+            args=[
+                self.__max_size,
+                self.__max_bytes or 0,
+                self.__max_age or 0,
+                time.time(),
+                *serialized,
+                *timestamps,
+            ],
+        )
+        return int(head)
+
+    async def all(self) -> list[T]:
+        _, items = await self.snapshot()
+        return items
+
+    async def snapshot(self) -> tuple[int, list[T]]:
+        await self.initialize()
+
+        pipe = self.__redis.pipeline(transaction=True)
+        await self.__bounds(pipe)
+        await pipe.lrange(  # type:ignore[misc]
+            self.__list_key, 0, self.__max_size - 1
+        )
+        (head, oldest, live), values = await pipe.execute()
+
+        # values are newest first, value at index i has sequence head - 1 - i
+        head = int(head)
+        alive = _alive(head, int(oldest), live)
+        return head, list(
+            self.__serializer.loads(value)
+            for i, value in reversed(list(enumerate(values)))
+            if head - 1 - i in alive
+        )
+
+    async def latest(self, n: int = 1) -> list[T]:
+        await self.initialize()
+
+        if n <= 0:
+            return []
+
+        if self.__max_age:
+            # expired values can be anywhere, not only the oldest ones
+            _, items = await self.snapshot()
+            return items[::-1][:n]
+
+        pipe = self.__redis.pipeline(transaction=True)
+        await self.__bounds(pipe)
+        await pipe.lrange(  # type:ignore[misc]
+            self.__list_key,
+            0,
+            min(n, self.__max_size) - 1,
+        )
+        (head, oldest, _), values = await pipe.execute()
+
+        count = int(head) - int(oldest)
+        return list(self.__serializer.loads(value) for value in values[:count])
+
+    async def since(self, cursor: int) -> tuple[int, list[T]] | None:
+        await self.initialize()
+
+        if cursor < 0:
+            return None
+
+        head, values = await self.__since(
+            keys=[
+                self.__head_key,
+                self.__list_key,
+                self.__tail_key,
+                self.__index_key,
+            ],
+            args=[self.__max_size, cursor, self.__max_age or 0, time.time()],
+        )
+        if values is None:
+            return None
+        return int(head), list(
+            self.__serializer.loads(value) for value in reversed(values)
+        )
+
+    async def range(self, start_ts: float, end_ts: float) -> list[T]:
+        await self.initialize()
+
+        values = await self.__range(
+            keys=[
+                self.__head_key,
+                self.__list_key,
+                self.__index_key,
+                self.__tail_key,
+            ],
+            args=[
+                self.__max_size,
+                start_ts,
+                end_ts,
+                self.__max_age or 0,
+                time.time(),
+            ],
+        )
+        return list(self.__serializer.loads(value) for value in values)
+
+    async def version(self) -> int:
+        await self.initialize()
+
+        return await self._head()
+
+    async def subscribe(self) -> AsyncGenerator[int]:
+        await self.initialize()
+
+        pubsub = self.__redis.pubsub()
+        await pubsub.subscribe(self.__channel_key)
+        try:
+            # subscription is established, so changes made
+            # after reading the head are not missed
+            yield await self._head()
+
+            while True:
+                # poll the socket with a timeout, blocking read
+                # would fail on the client's socket timeout
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=1.0,
+                )
+                if message is not None:
+                    yield int(message["data"])
+        finally:
+            await pubsub.aclose()  # type:ignore[no-untyped-call]
+
+    async def clear(self) -> bool:
+        await self.initialize()
+
+        pipe = self.__redis.pipeline(transaction=True)
+        await pipe.delete(
+            self.__list_key, self.__index_key, self.__tail_key, self.__bytes_key
+        )
+        await pipe.set(self.__head_key, 0)
+        await pipe.publish(self.__channel_key, 0)
+        await pipe.execute()
+        return True
+
+    async def size(self) -> int:
+        await self.initialize()
+
+        head, oldest, live = await self.__bounds(self.__redis)
+        return len(_alive(int(head), int(oldest), live))
+
+    async def stats(self) -> dict[str, int]:
+        await self.initialize()
+
+        return await _stats(
+            self.__redis,
+            self.__head_key,
+            self.__tail_key,
+            self.__bytes_key,
+            self.__max_size,
+        )
+
+
+class RedisStreamRingBuffer[T](IRingBuffer[T]):
+    __write_many: AsyncScript
+    __range: AsyncScript
+    __live: AsyncScript
+    __backfill: AsyncScript
+    __clear: AsyncScript
+    __migrate: AsyncScript
+
+    def __init__(
+        self,
+        redis: Redis,
+        name: str,
+        max_size: int,
+        serializer: ISerializer[T] = pickle,  # type:ignore[assignment]
+        timestamp: Callable[[T], float] | None = None,
+        max_bytes: int | None = None,
+        max_age: float | None = None,
+        block_ms: int = 1000,
+    ):
+        """
+        :param redis: Redis client
+        :type redis: Redis
+        :param name: Unique name for the buffer
+        :type name: str
+        :param max_size: Maximum number of elements
+        :type max_size: int
+        :param serializer: Serializer for redis
+        :type serializer: ISerializer[T]
+        :param timestamp: Function returning the timestamp to index
+            an item by, time of the write by default
+        :type timestamp: Callable[[T], float] | None
+        :param max_bytes: Maximum total size of serialized elements,
+            oldest ones are evicted on write to stay within it
+        :type max_bytes: int | None
+        :param max_age: Maximum age of elements in seconds, by their
+            timestamps, older ones are skipped on read and evicted on
+            write once they are the oldest ones
+        :type max_age: float | None
+        :param block_ms: Milliseconds to block for on tail reads,
+            should be less than socket timeout of the client
+        :type block_ms: int
+        """
+        self.__redis = redis
+        self.__name = name
+        self.__max_size = max_size
+        self.__serializer = serializer
+        self.__timestamp = timestamp
+        self.__max_bytes = max_bytes
+        self.__max_age = max_age
+        self.__block_ms = block_ms
+        self.__head_key = f"{name}:head"
+        self.__stream_key = f"{name}:stream"
+        self.__data_key = f"{name}:data"  # hash layout, migrated on initialization
+        self.__channel_key = f"{name}:changes"
+        self.__index_key = f"{name}:index"
+        self.__tail_key = f"{name}:tail"
+        self.__bytes_key = f"{name}:bytes"
+        self.__initialized = False
+
+    async def initialize(self) -> None:
+        if self.__initialized:
+            return
+
+        self.__write_many = self.__redis.register_script(
+            SCRIPTS["stream/write_many.lua"]
+        )
+        self.__range = self.__redis.register_script(SCRIPTS["stream/range.lua"])
+        self.__live = self.__redis.register_script(SCRIPTS["stream/live.lua"])
+        self.__backfill = self.__redis.register_script(SCRIPTS["index/backfill.lua"])
+        self.__clear = self.__redis.register_script(SCRIPTS["stream/clear.lua"])
+        self.__migrate = self.__redis.register_script(SCRIPTS["stream/migrate.lua"])
+
+        # one round trip creates the head and caches every script,
+        # scripts are loaded again on NOSCRIPT after a redis restart
+        await _prepare(
+            self.__redis,
+            self.__head_key,
+            [
+                self.__write_many,
+                self.__range,
+                self.__live,
+                self.__clear,
+                self.__migrate,
+                self.__backfill,
+            ],
+        )
+
+        # items written by RedisRingBuffer with the same
+        # name are moved to the stream, keeping their versions
+        await self.__migrate(
+            keys=[self.__head_key, self.__stream_key, self.__data_key],
+            args=[self.__max_size],
+        )
+        await self.__index()
+
+        self.__initialized = True
+
+    async def __index(self) -> None:
+        # values written before the index existed are indexed by
+        # their timestamps, so they are not taken for expired ones
+        sequences = await _unindexed(
+            self.__redis,
+            self.__head_key,
+            self.__tail_key,
+            self.__index_key,
+            self.__max_size,
+        )
+        if not sequences:
+            return
+
+        # entry ids are sequence numbers plus one
+        entries = await self.__redis.xrange(
+            self.__stream_key, min=f"{sequences.start + 1}-0"
+        )
+        timestamps = {}
+        for entry_id, fields in entries:
+            value = self.__serializer.loads(fields[b"value"])
+            timestamps[self.__decode(entry_id) - 1] = self.__timestamp_of(value)
+        await self.__fill(timestamps)
+
+    async def __fill(self, timestamps: dict[int, float]) -> None:
+        await _backfill(
+            self.__redis,
+            self.__backfill,
+            self.__head_key,
+            self.__tail_key,
+            self.__index_key,
+            self.__max_size,
+            timestamps,
+        )
+
+    async def _head(self) -> int:
+        head = await self.__redis.get(self.__head_key)
+        return int(head) if head else 0
+
+    def __decode(self, entry_id: bytes | str) -> int:
+        entry_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+        return int(entry_id.split("-")[0])
+
+    async def __bounds(self, client: Redis) -> list[Any]:
+        # head, the oldest value still in the stream and values not expired,
+        # queued on the client if it is a pipeline
+        return await self.__live(  # type:ignore[no-any-return]
+            keys=[self.__head_key, self.__tail_key, self.__index_key],
+            args=[self.__max_size, self.__max_age or 0, time.time()],
+            client=client,
+        )
+
+    def __timestamp_of(self, value: T) -> float:
+        if self.__timestamp is None:
+            return time.time()
+        return self.__timestamp(value)
+
+    async def put(self, value: T) -> int:
+        # a single value goes through the same script,
+        # so eviction is implemented in one place
+        return await self.put_many([value])
+
+    async def put_many(self, values: Sequence[T]) -> int:
+        await self.initialize()
+
+        if not values:
+            return await self._head()
+
+        serialized = [self.__serializer.dumps(value) for value in values]
+        timestamps = [self.__timestamp_of(value) for value in values]
+
+        head = await self.__write_many(
+            keys=[
+                self.__head_key,
+                self.__stream_key,
+                self.__channel_key,
+                self.__index_key,
+                self.__tail_key,
+                self.__bytes_key,
+            ],
+            args=[
+                self.__max_size,
+                self.__max_bytes or 0,
+                self.__max_age or 0,
+                time.time(),
+                *serialized,
+                *timestamps,
+            ],
+        )
+        return int(head)
+
+    async def all(self) -> list[T]:
+        _, items = await self.snapshot()
+        return items
+
+    async def snapshot(self) -> tuple[int, list[T]]:
+        await self.initialize()
+
+        # streams trimmed approximately by earlier versions
+        # may hold a few more entries than max_size
+        pipe = self.__redis.pipeline(transaction=True)
+        await self.__bounds(pipe)
+        await pipe.xrevrange(self.__stream_key, count=self.__max_size)
+        (head, oldest, live), entries = await pipe.execute()
+
+        # entry ids are sequence numbers plus one
+        alive = _alive(int(head), int(oldest), live)
+        return int(head), list(
+            self.__serializer.loads(fields[b"value"])
+            for entry_id, fields in reversed(entries)
+            if self.__decode(entry_id) - 1 in alive
+        )
+
+    async def latest(self, n: int = 1) -> list[T]:
+        await self.initialize()
+
+        if self.__max_age:
+            # expired values can be anywhere, not only the oldest ones
+            _, items = await self.snapshot()
+            return items[::-1][:n]
+
+        pipe = self.__redis.pipeline(transaction=True)
+        await self.__bounds(pipe)
+        await pipe.xrevrange(self.__stream_key, count=min(n, self.__max_size))
+        (_, oldest, _), entries = await pipe.execute()
+
+        return list(
+            self.__serializer.loads(fields[b"value"])
+            for entry_id, fields in entries
+            if self.__decode(entry_id) > int(oldest)
+        )
+
+    async def since(self, cursor: int) -> tuple[int, list[T]] | None:
+        await self.initialize()
+
+        if cursor < 0:
+            return None
+
+        pipe = self.__redis.pipeline(transaction=True)
+        await self.__bounds(pipe)
+        await pipe.xrange(self.__stream_key, min=f"{cursor + 1}-0")
+        (head, oldest, live), entries = await pipe.execute()
+
+        head, oldest = int(head), int(oldest)
+        if cursor > head or cursor < oldest:
+            return None
+        alive = _alive(head, oldest, live)
+        return head, list(
+            self.__serializer.loads(fields[b"value"])
+            for entry_id, fields in entries
+            if self.__decode(entry_id) - 1 in alive
+        )
+
+    async def range(self, start_ts: float, end_ts: float) -> list[T]:
+        await self.initialize()
+
+        values = await self.__range(
+            keys=[
+                self.__head_key,
+                self.__stream_key,
+                self.__index_key,
+                self.__tail_key,
+            ],
+            args=[
+                self.__max_size,
+                start_ts,
+                end_ts,
+                self.__max_age or 0,
+                time.time(),
+            ],
+        )
+        return list(self.__serializer.loads(value) for value in values)
+
+    async def version(self) -> int:
+        await self.initialize()
+
+        return await self._head()
+
+    async def subscribe(self) -> AsyncGenerator[int]:
+        await self.initialize()
+
+        head = await self._head()
+        yield head
+
+        async for version, _ in self.__read(head):
+            yield version
+
+    async def tail(self, cursor: int | None = None) -> AsyncGenerator[tuple[int, T]]:
+        """
+        Wait for items written after the cursor.
+        Blocks on the server instead of polling it.
+
+        :param cursor: Version to read after, current one by default
+        :type cursor: int | None
+        :return: Versions and items in the order they were written
+        :rtype: AsyncGenerator[tuple[int, T]]
+        """
+        await self.initialize()
+
+        if cursor is None:
+            cursor = await self._head()
+
+        async for version, value in self.__read(cursor):
+            if value is not None:
+                yield version, self.__serializer.loads(value)
+
+    async def __read(self, cursor: int) -> AsyncGenerator[tuple[int, bytes | None]]:
+        while True:
+            response = await self.__redis.xread(
+                {self.__stream_key: f"{cursor}-0"},
+                block=self.__block_ms,
+            )
+            if not response:
+                # nothing was written, but the buffer could have
+                # been cleared and entry ids started over
+                head = await self._head()
+                if head < cursor:
+                    cursor = head
+                    yield head, None
+                continue
+
+            for _, entries in response:
+                for entry_id, fields in entries:
+                    cursor = self.__decode(entry_id)
+                    yield cursor, fields[b"value"]
+
+    async def clear(self) -> bool:
+        await self.initialize()
+
+        await self.__clear(
+            keys=[
+                self.__head_key,
+                self.__stream_key,
+                self.__channel_key,
+                self.__index_key,
+                self.__tail_key,
+                self.__bytes_key,
+            ],
+            args=[],
+        )
+        return True
+
+    async def size(self) -> int:
+        await self.initialize()
+
+        head, oldest, live = await self.__bounds(self.__redis)
+        return len(_alive(int(head), int(oldest), live))
+
+    async def stats(self) -> dict[str, int]:
+        await self.initialize()
+
+        return await _stats(
+            self.__redis,
+            self.__head_key,
+            self.__tail_key,
+            self.__bytes_key,
+            self.__max_size,
+        )
@@ -0,0 +1,50 @@
+import asyncio
+from typing import Any
+
+from redis.asyncio import Redis
+
+from services.interfaces import IEncodedRingBuffer
+from services.serializers import json_dumps
+from services.visitors import get_visitors_count
+
+
+async def encode_snapshot(
+    changelog: IEncodedRingBuffer[Any],
+    locations: IEncodedRingBuffer[Any],
+    redis: Redis,
+    visitors_key: str,
+) -> bytes:
+    """
+    Encode the current state of every widget as one JSON document,
+    e.g. {"changelog": {"updates": [...]}, "locations": {...}, "visitors": {...}}.
+
+    :param changelog: Changelog buffer
+    :type changelog: IEncodedRingBuffer[Any]
+    :param locations: Locations buffer
+    :type locations: IEncodedRingBuffer[Any]
+    :param redis: Redis client
+    :type redis: Redis
+    :param visitors_key: Key of the visitors counter
+    :type visitors_key: str
+    :return: Encoded document
+    :rtype: bytes
+    """
+    # reads are sent at once, buffers answer from
+    # their caches, usually without a round trip at all
+    (_, updates), (_, seen), count = await asyncio.gather(
+        changelog.encoded("updates"),
+        locations.encoded("locations"),
+        get_visitors_count(redis, visitors_key),
+    )
+    # cached documents are embedded as is, without decoding them again
+    return b"".join(
+        (
+            b'{"changelog":',
+            updates,
+            b',"locations":',
+            seen,
+            b',"visitors":',
+            json_dumps({"count": count}),
+            b"}",
+        )
+    )
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import UTC, date, datetime, timedelta
+
+from redis.asyncio import Redis
+from redis.commands.core import AsyncScript
+
+from services.interfaces import IPresence, IUniqueVisitors
+from services.redis import SCRIPTS
+
+
+async def get_visitors_count(redis: Redis, key: str) -> int:
+    count = await redis.get(key)
+    return int(count) if count else 0
+
+
+class PresenceCounter(IPresence):
+    def __init__(
+        self,
+        redis: Redis,
+        key: str,
+        interval: float,
+        ttl: float,
+        instance: str | None = None,
+    ) -> None:
+        """
+        Counts connections to this instance in process memory and
+        publishes them with heartbeats, so redis is written once
+        per interval by every instance rather than by every visitor.
+
+        Every heartbeat stores the total over live instances at the key.
+        Instances that die without cleaning up stop being counted
+        once their last heartbeat is older than ttl.
+
+        :param redis: Redis client
+        :type redis: Redis
+        :param key: Key of the total
+        :type key: str
+        :param interval: Seconds between two heartbeats
+        :type interval: float
+        :param ttl: Seconds an instance is counted for after a heartbeat,
+            should be a few intervals long
+        :type ttl: float
+        :param instance: Unique name of this instance, host and pid by default
+        :type instance: str | None
+        """
+        self.__redis = redis
+        self.__key = key
+        self.__counts_key = f"{key}:instances"
+        self.__heartbeats_key = f"{key}:heartbeats"
+        self.__interval = interval
+        self.__ttl = ttl
+        self.__instance = instance or f"{socket.gethostname()}:{os.getpid()}"
+        self.__connections = 0
+        self.__heartbeat: AsyncScript | None = None
+        self.__task: asyncio.Task[None] | None = None
+
+    def join(self) -> None:
+        self.__connections += 1
+
+    def leave(self) -> None:
+        self.__connections = max(self.__connections - 1, 0)
+
+    async def __beat(self, connections: int) -> int:
+        if self.__heartbeat is None:
+            self.__heartbeat = self.__redis.register_script(
+                SCRIPTS["presence/heartbeat.lua"]
+            )
+
+        total = await self.__heartbeat(
+            keys=[self.__key, self.__counts_key, self.__heartbeats_key],
+            args=[self.__instance, connections, time.time(), self.__ttl],
+        )
+        return int(total)
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                await self.__beat(self.__connections)
+            except Exception as e:
+                logging.error(f"Error sending heartbeat of {self} - {str(e)}")
+            await asyncio.sleep(self.__interval)
+
+    async def start(self) -> None:
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        if self.__task is not None:
+            self.__task.cancel()
+            self.__task = None
+
+        # connections of this instance leave the total right away,
+        # instead of being counted until the heartbeat expires
+        await self.__beat(0)
+
+
+class UniqueVisitors(IUniqueVisitors):
+    def __init__(
+        self,
+        redis: Redis,
+        prefix: str,
+        retention_days: int,
+        flush_seconds: float,
+    ) -> None:
+        """
+        Counts unique visitors with a HyperLogLog per day, so every day
+        takes about 12 KB however many visitors there are, and IP
+        addresses themselves are never stored.
+
+        Visits are recorded in process memory and flushed
+        with a single pipeline once per flush_seconds,
+        so requests never wait for redis.
+
+        :param redis: Redis client
+        :type redis: Redis
+        :param prefix: Prefix of the daily keys, followed by the date
+        :type prefix: str
+        :param retention_days: Days a daily key is kept for after the last write
+        :type retention_days: int
+        :param flush_seconds: Seconds to gather visits for before storing them
+        :type flush_seconds: float
+        """
+        self.__redis = redis
+        self.__prefix = prefix
+        self.__retention_days = retention_days
+        self.__flush_seconds = flush_seconds
+        self.__pending: dict[str, set[str]] = {}
+        self.__task: asyncio.Task[None] | None = None
+
+    def __key(self, day: date) -> str:
+        return f"{self.__prefix}:{day.isoformat()}"
+
+    def record(self, ip: str) -> None:
+        key = self.__key(datetime.now(UTC).date())
+        self.__pending.setdefault(key, set()).add(ip)
+
+        if self.__task is None or self.__task.done():
+            self.__task = asyncio.create_task(self.__flush_later())
+
+    async def __flush_later(self) -> None:
+        # visits recorded within the window are sent together
+        await asyncio.sleep(self.__flush_seconds)
+        try:
+            await self.flush()
+        except Exception as e:
+            logging.error(f"Error flushing visits in {self} - {str(e)}")
+
+    async def flush(self) -> None:
+        pending, self.__pending = self.__pending, {}
+        if not pending:
+            return
+
+        pipe = self.__redis.pipeline(transaction=False)
+        for key, ips in pending.items():
+            await pipe.pfadd(key, *ips)
+            await pipe.expire(key, timedelta(days=self.__retention_days))
+        await pipe.execute()
+
+    async def count(self, days: int) -> int:
+        today = datetime.now(UTC).date()
+        keys = [self.__key(today - timedelta(days=i)) for i in range(days)]
+        # merged on the fly, without storing the union
+        count = await self.__redis.pfcount(*keys)
+        return int(count) if count else 0
@@ -63,6 +63,8 @@ document.addEventListener('DOMContentLoaded', function() {
   let connectionFailed = false;
   const seenUpdateIds = new Set();
   let eventSource = null; // Store the eventSource reference globally for cleanup
+  let lastEventId = null; // Version of the last received data, used to resume the stream
+  let streamCache = []; // Data as of lastEventId, deltas are applied on top of it
   let initialDataFetched = false;
   let widgetInitialized = false;
   const maxRetryAttempts = 3;
@@ -340,6 +342,23 @@ document.addEventListener('DOMContentLoaded', function() {
 
   // ===== DATA FETCHING =====
   function fetchInitialData() {
+    // Initial data of every widget comes in one snapshot,
+    // rendered into the page or fetched once for all of them
+    const request = window.LiveSnapshot ?
+                    window.LiveSnapshot.load('changelog') :
+                    fetchJSON(ENDPOINTS.INITIAL_DATA);
+
+    return request.then(data => {
+      if (data.updates && Array.isArray(data.updates)) {
+        initialDataFetched = true;
+        // Items go from oldest to newest, the newest ones are kept
+        return data.updates.slice(-CONFIG.MAX_UPDATES);
+      }
+      throw new Error('Invalid data format');
+    });
+  }
+
+  function fetchJSON(url) {
     return new Promise((resolve, reject) => {
       const xhr = new XMLHttpRequest();
 
@@ -347,13 +366,7 @@ document.addEventListener('DOMContentLoaded', function() {
         if (xhr.readyState === 4) {
           if (xhr.status === 200) {
             try {
-              const data = JSON.parse(xhr.responseText);
-              if (data.updates && Array.isArray(data.updates)) {
-                initialDataFetched = true;
-                resolve(data.updates.slice(0, CONFIG.MAX_UPDATES));
-              } else {
-                reject(new Error('Invalid data format'));
-              }
+              resolve(JSON.parse(xhr.responseText));
             } catch (error) {
               reject(error);
             }
@@ -366,11 +379,18 @@ document.addEventListener('DOMContentLoaded', function() {
       xhr.timeout = TIMEOUTS.INITIAL_FETCH;
       xhr.ontimeout = () => reject(new Error('Request timeout'));
 
-      xhr.open('GET', ENDPOINTS.INITIAL_DATA, true);
+      xhr.open('GET', url, true);
       xhr.send();
     });
   }
 
+  function getStreamUrl() {
+    if (lastEventId === null) {
+      return ENDPOINTS.SSE_STREAM;
+    }
+    return `${ENDPOINTS.SSE_STREAM}?lastEventId=${encodeURIComponent(lastEventId)}`;
+  }
+
   function cleanupSSE() {
     if (eventSource) {
       console.log('Closing SSE connection...');
@@ -395,7 +415,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
     try {
       console.log('Establishing SSE connection...');
-      eventSource = new EventSource(ENDPOINTS.SSE_STREAM);
+      // Share one connection with other widgets when the page provides it
+      eventSource = window.LiveStream ?
+                    window.LiveStream.open('changelog', lastEventId) :
+                    new EventSource(getStreamUrl());
       retryCount++;
 
       const connectionTimeout = setTimeout(() => {
@@ -423,7 +446,9 @@ document.addEventListener('DOMContentLoaded', function() {
           const data = JSON.parse(event.data);
 
           if (data.updates && Array.isArray(data.updates)) {
-            updatesCache = data.updates.slice(0, CONFIG.MAX_UPDATES);
+            updatesCache = data.updates.slice(-CONFIG.MAX_UPDATES);
+            streamCache = [...updatesCache];
+            lastEventId = event.lastEventId || null;
             updateChangelogList();
             updateChangesCount();
           } else if (data.id && data.title && data.type && data.description && data.version && data.date) {
@@ -455,6 +480,28 @@ document.addEventListener('DOMContentLoaded', function() {
         }
       };
 
+      eventSource.addEventListener('delta', function(event) {
+        try {
+          const data = JSON.parse(event.data);
+
+          if (!data.updates || !Array.isArray(data.updates)) {
+            throw new Error('Invalid data format');
+          }
+
+          // Delta holds only items written after lastEventId
+          streamCache = streamCache.concat(data.updates).slice(-CONFIG.MAX_UPDATES);
+          lastEventId = event.lastEventId || null;
+
+          updatesCache = [...streamCache];
+          updateChangelogList();
+          updateChangesCount();
+        } catch (error) {
+          console.error('Error parsing SSE delta:', error);
+          // Request a full snapshot on the next connection
+          lastEventId = null;
+        }
+      });
+
       eventSource.onerror = function(error) {
         console.error('SSE connection error:', error);
         clearTimeout(connectionTimeout);
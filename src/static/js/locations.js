@@ -53,6 +53,8 @@ document.addEventListener('DOMContentLoaded', function() {
   let initialLocationCache = null;
   let connectionFailed = false;
   let eventSource = null;
+  let lastEventId = null; // Version of the last received data, used to resume the stream
+  let streamCache = []; // Data as of lastEventId, deltas are applied on top of it
   let timestampRefreshInterval = null;
   let initialDataFetched = false;
   let widgetInitialized = false;
@@ -295,6 +297,23 @@ document.addEventListener('DOMContentLoaded', function() {
 
   // ===== DATA FETCHING =====
   function fetchInitialData() {
+    // Initial data of every widget comes in one snapshot,
+    // rendered into the page or fetched once for all of them
+    const request = window.LiveSnapshot ?
+                    window.LiveSnapshot.load('locations') :
+                    fetchJSON(ENDPOINTS.INITIAL_DATA);
+
+    return request.then(data => {
+      if (data.locations && Array.isArray(data.locations)) {
+        initialDataFetched = true;
+        // Items go from oldest to newest, the newest ones are kept
+        return data.locations.slice(-CONFIG.MAX_LOCATIONS);
+      }
+      throw new Error('Invalid data format');
+    });
+  }
+
+  function fetchJSON(url) {
     return new Promise((resolve, reject) => {
       const xhr = new XMLHttpRequest();
 
@@ -302,13 +321,7 @@ document.addEventListener('DOMContentLoaded', function() {
         if (xhr.readyState === 4) {
           if (xhr.status === 200) {
             try {
-              const data = JSON.parse(xhr.responseText);
-              if (data.locations && Array.isArray(data.locations)) {
-                initialDataFetched = true;
-                resolve(data.locations.slice(0, CONFIG.MAX_LOCATIONS));
-              } else {
-                reject(new Error('Invalid data format'));
-              }
+              resolve(JSON.parse(xhr.responseText));
             } catch (error) {
               reject(error);
             }
@@ -321,11 +334,18 @@ document.addEventListener('DOMContentLoaded', function() {
       xhr.timeout = TIMEOUTS.INITIAL_FETCH;
       xhr.ontimeout = () => reject(new Error('Request timeout'));
 
-      xhr.open('GET', ENDPOINTS.INITIAL_DATA, true);
+      xhr.open('GET', url, true);
       xhr.send();
     });
   }
 
+  function getStreamUrl() {
+    if (lastEventId === null) {
+      return ENDPOINTS.SSE_STREAM;
+    }
+    return `${ENDPOINTS.SSE_STREAM}?lastEventId=${encodeURIComponent(lastEventId)}`;
+  }
+
   function cleanupSSE() {
     if (eventSource) {
       console.log('Closing SSE connection...');
@@ -350,7 +370,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
     try {
       console.log('Establishing SSE connection...');
-      eventSource = new EventSource(ENDPOINTS.SSE_STREAM);
+      // Share one connection with other widgets when the page provides it
+      eventSource = window.LiveStream ?
+                    window.LiveStream.open('locations', lastEventId) :
+                    new EventSource(getStreamUrl());
       retryCount++;
 
       const connectionTimeout = setTimeout(() => {
@@ -380,7 +403,9 @@ document.addEventListener('DOMContentLoaded', function() {
           const oldLocations = JSON.parse(JSON.stringify(locationCache));
 
           if (data.locations && Array.isArray(data.locations)) {
-            locationCache = data.locations.slice(0, CONFIG.MAX_LOCATIONS);
+            locationCache = data.locations.slice(-CONFIG.MAX_LOCATIONS);
+            streamCache = [...locationCache];
+            lastEventId = event.lastEventId || null;
             updateLocationsList();
             updateLocationsCount();
           } else if (data.location && data.timestamp) {
@@ -408,6 +433,28 @@ document.addEventListener('DOMContentLoaded', function() {
         }
       };
 
+      eventSource.addEventListener('delta', function(event) {
+        try {
+          const data = JSON.parse(event.data);
+
+          if (!data.locations || !Array.isArray(data.locations)) {
+            throw new Error('Invalid data format');
+          }
+
+          // Delta holds only items written after lastEventId
+          streamCache = streamCache.concat(data.locations).slice(-CONFIG.MAX_LOCATIONS);
+          lastEventId = event.lastEventId || null;
+
+          locationCache = [...streamCache];
+          updateLocationsList();
+          updateLocationsCount();
+        } catch (error) {
+          console.error('Error parsing SSE delta:', error);
+          // Request a full snapshot on the next connection
+          lastEventId = null;
+        }
+      });
+
       eventSource.onerror = function(error) {
         console.error('SSE connection error:', error);
         clearTimeout(connectionTimeout);
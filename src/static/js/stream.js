@@ -0,0 +1,253 @@
+(function() {
+  // ===== CONSTANTS =====
+  // Widgets open a channel per topic and all channels share
+  // a single connection, instead of one connection per widget
+  const ENDPOINTS = {
+    SSE_STREAM: '/api/v1/stream', // Endpoint for multiplexed SSE updates
+    SNAPSHOT: '/api/v1/snapshot' // Endpoint for initial data of every widget
+  };
+
+  const TIMEOUTS = {
+    CONNECT_DELAY: 100, // 100ms to gather channels opened together into one connection
+    SNAPSHOT_FETCH: 5000 // 5 seconds for snapshot fetch
+  };
+
+  const ELEMENTS = {
+    INITIAL_SNAPSHOT: 'initialSnapshot' // Snapshot rendered into the page
+  };
+
+  const READY_STATES = {
+    CONNECTING: 0,
+    OPEN: 1,
+    CLOSED: 2
+  };
+
+  // ===== STATE VARIABLES =====
+  const channels = new Map(); // topic -> channel
+  const versions = {}; // topic -> version of the last received data
+  let eventSource = null;
+  let connectTimer = null;
+  let snapshot = readInitialSnapshot(); // section -> data not handed out yet
+  let snapshotRequest = null;
+
+  // ===== CHANNEL =====
+  // Mimics the part of EventSource API the widgets use
+  class Channel {
+    constructor(topic) {
+      this.topic = topic;
+      this.readyState = READY_STATES.CONNECTING;
+      this.onopen = null;
+      this.onmessage = null;
+      this.onerror = null;
+      this.listeners = {};
+    }
+
+    addEventListener(type, listener) {
+      (this.listeners[type] = this.listeners[type] || []).push(listener);
+    }
+
+    dispatch(type, event) {
+      const handler = this[`on${type}`];
+      if (handler) {
+        handler.call(this, event);
+      }
+      (this.listeners[type] || []).forEach(listener => listener.call(this, event));
+    }
+
+    close() {
+      this.readyState = READY_STATES.CLOSED;
+      if (channels.get(this.topic) === this) {
+        channels.delete(this.topic);
+        scheduleConnection();
+      }
+    }
+  }
+
+  // ===== CONNECTION =====
+  function parseVersions(lastEventId) {
+    // Multiplexed ids look like "changelog:12,locations:40"
+    lastEventId.split(',').forEach(pair => {
+      const [topic, version] = pair.split(':');
+      if (topic && version) {
+        versions[topic] = version;
+      }
+    });
+  }
+
+  function getStreamUrl() {
+    const topics = [...channels.keys()];
+    const params = new URLSearchParams({ topics: topics.join(',') });
+    const cursors = topics
+      .filter(topic => versions[topic] !== undefined)
+      .map(topic => `${topic}:${versions[topic]}`);
+
+    if (cursors.length > 0) {
+      params.set('lastEventId', cursors.join(','));
+    }
+    return `${ENDPOINTS.SSE_STREAM}?${params}`;
+  }
+
+  function forward(topic, type) {
+    return function(event) {
+      if (event.lastEventId) {
+        parseVersions(event.lastEventId);
+      }
+
+      const channel = channels.get(topic);
+      if (channel) {
+        channel.dispatch(type, new MessageEvent(type, {
+          data: event.data,
+          lastEventId: versions[topic] || ''
+        }));
+      }
+    };
+  }
+
+  function disconnect() {
+    if (eventSource) {
+      eventSource.onopen = null;
+      eventSource.onerror = null;
+      eventSource.close();
+      eventSource = null;
+    }
+  }
+
+  function connect() {
+    connectTimer = null;
+    disconnect();
+
+    if (channels.size === 0) {
+      return;
+    }
+
+    const source = new EventSource(getStreamUrl());
+    channels.forEach((_, topic) => {
+      source.addEventListener(topic, forward(topic, 'message'));
+      source.addEventListener(`${topic}-delta`, forward(topic, 'delta'));
+    });
+
+    source.onopen = function(event) {
+      channels.forEach(channel => {
+        channel.readyState = READY_STATES.OPEN;
+        channel.dispatch('open', event);
+      });
+    };
+
+    source.onerror = function(event) {
+      // Widgets handle errors and reconnect on their own,
+      // they reopen their channels when they are ready
+      disconnect();
+      [...channels.values()].forEach(channel => channel.dispatch('error', event));
+    };
+
+    eventSource = source;
+  }
+
+  function scheduleConnection() {
+    if (connectTimer === null) {
+      connectTimer = setTimeout(connect, TIMEOUTS.CONNECT_DELAY);
+    }
+  }
+
+  // ===== SNAPSHOT =====
+  function readInitialSnapshot() {
+    const element = document.getElementById(ELEMENTS.INITIAL_SNAPSHOT);
+    if (!element) {
+      return null;
+    }
+
+    try {
+      return JSON.parse(element.textContent);
+    } catch (error) {
+      console.error('Error parsing initial snapshot:', error);
+      return null;
+    }
+  }
+
+  function fetchSnapshot() {
+    return new Promise((resolve, reject) => {
+      const xhr = new XMLHttpRequest();
+
+      xhr.onreadystatechange = function() {
+        if (xhr.readyState === 4) {
+          if (xhr.status === 200) {
+            try {
+              resolve(JSON.parse(xhr.responseText));
+            } catch (error) {
+              reject(error);
+            }
+          } else {
+            reject(new Error(`HTTP error: ${xhr.status}`));
+          }
+        }
+      };
+
+      xhr.timeout = TIMEOUTS.SNAPSHOT_FETCH;
+      xhr.ontimeout = () => reject(new Error('Request timeout'));
+
+      xhr.open('GET', ENDPOINTS.SNAPSHOT, true);
+      xhr.send();
+    });
+  }
+
+  function takeSection(section) {
+    const data = snapshot && snapshot[section];
+    if (data === undefined || data === null) {
+      return null;
+    }
+    // Every section is handed out once, widgets
+    // loading data again get a fresh snapshot
+    delete snapshot[section];
+    return data;
+  }
+
+  // ===== PUBLIC API =====
+  window.LiveSnapshot = {
+    load(section) {
+      const data = takeSection(section);
+      if (data !== null) {
+        return Promise.resolve(data);
+      }
+
+      // Widgets loading together share a single request
+      if (snapshotRequest === null) {
+        snapshotRequest = fetchSnapshot()
+          .then(fetched => {
+            snapshot = fetched;
+          })
+          .finally(() => {
+            snapshotRequest = null;
+          });
+      }
+      return snapshotRequest.then(() => {
+        const fetched = takeSection(section);
+        if (fetched === null) {
+          throw new Error('Invalid data format');
+        }
+        return fetched;
+      });
+    }
+  };
+
+  window.LiveStream = {
+    open(topic, lastEventId = null) {
+      const previous = channels.get(topic);
+      if (previous) {
+        previous.readyState = READY_STATES.CLOSED;
+      }
+
+      if (lastEventId === null) {
+        delete versions[topic];
+      } else {
+        versions[topic] = lastEventId;
+      }
+
+      const channel = new Channel(topic);
+      channels.set(topic, channel);
+      scheduleConnection();
+      return channel;
+    }
+  };
+
+  window.addEventListener('pagehide', disconnect);
+})();
@@ -180,6 +180,23 @@ document.addEventListener('DOMContentLoaded', function() {
 
   // ===== DATA FETCHING =====
   function fetchInitialData() {
+    // Initial data of every widget comes in one snapshot,
+    // rendered into the page or fetched once for all of them
+    const request = window.LiveSnapshot ?
+                    window.LiveSnapshot.load('visitors') :
+                    fetchJSON(ENDPOINTS.INITIAL_DATA);
+
+    return request.then(data => {
+      if (data.count !== undefined) {
+        initialDataFetched = true;
+        initialCountValue = data.count;
+        return data.count;
+      }
+      throw new Error('Invalid data format');
+    });
+  }
+
+  function fetchJSON(url) {
     return new Promise((resolve, reject) => {
       const xhr = new XMLHttpRequest();
 
@@ -187,14 +204,7 @@ document.addEventListener('DOMContentLoaded', function() {
         if (xhr.readyState === 4) {
           if (xhr.status === 200) {
             try {
-              const data = JSON.parse(xhr.responseText);
-              if (data.count !== undefined) {
-                initialDataFetched = true;
-                initialCountValue = data.count;
-                resolve(data.count);
-              } else {
-                reject(new Error('Invalid data format'));
-              }
+              resolve(JSON.parse(xhr.responseText));
             } catch (error) {
               reject(error);
             }
@@ -207,7 +217,7 @@ document.addEventListener('DOMContentLoaded', function() {
       xhr.timeout = TIMEOUTS.INITIAL_FETCH;
       xhr.ontimeout = () => reject(new Error('Request timeout'));
 
-      xhr.open('GET', ENDPOINTS.INITIAL_DATA, true);
+      xhr.open('GET', url, true);
       xhr.send();
     });
   }
@@ -234,7 +244,10 @@ document.addEventListener('DOMContentLoaded', function() {
 
     try {
       console.log('Establishing SSE connection...');
-      eventSource = new EventSource(ENDPOINTS.SSE_STREAM);
+      // Share one connection with other widgets when the page provides it
+      eventSource = window.LiveStream ?
+                    window.LiveStream.open('visitors') :
+                    new EventSource(ENDPOINTS.SSE_STREAM);
       retryCount++;
 
       const connectionTimeout = setTimeout(() => {
@@ -0,0 +1,94 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+from fastapi import Request
+
+from services.interfaces import IBroadcaster
+
+
+def _get_raw_last_event_id(request: Request) -> str | None:
+    # EventSource sends the header on its own reconnects only,
+    # scripts that reconnect manually pass the id as a query param
+    return request.headers.get("Last-Event-ID") or request.query_params.get(
+        "lastEventId"
+    )
+
+
+def get_last_event_id(request: Request) -> int | None:
+    value = _get_raw_last_event_id(request)
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def get_last_event_ids(request: Request) -> dict[str, int]:
+    """
+    Parse the id of a multiplexed stream,
+    e.g. "changelog:12,locations:40", into versions by topic.
+    """
+    value = _get_raw_last_event_id(request)
+    if not value:
+        return {}
+
+    cursors = {}
+    for pair in value.split(","):
+        topic, _, version = pair.partition(":")
+        try:
+            cursors[topic] = int(version)
+        except ValueError:
+            continue
+    return cursors
+
+
+def format_last_event_ids(versions: dict[str, str]) -> str:
+    return ",".join(f"{topic}:{version}" for topic, version in versions.items())
+
+
+async def listen(
+    broadcaster: IBroadcaster[dict[str, str]],
+    last_event_id: str | None = None,
+) -> AsyncGenerator[dict[str, str]]:
+    queue = broadcaster.subscribe()
+    try:
+        while True:
+            event = await queue.get()
+            if last_event_id is not None and event.get("id") == last_event_id:
+                # subscriber is already up to date with this version
+                continue
+            yield event
+    finally:
+        broadcaster.unsubscribe(queue)
+
+
+async def listen_many(
+    broadcasters: dict[str, IBroadcaster[dict[str, str]]],
+    last_event_ids: dict[str, str] | None = None,
+) -> AsyncGenerator[tuple[str, dict[str, str]]]:
+    last_event_ids = last_event_ids or {}
+    queues = {
+        topic: broadcaster.subscribe() for topic, broadcaster in broadcasters.items()
+    }
+    getters = {
+        asyncio.ensure_future(queue.get()): topic for topic, queue in queues.items()
+    }
+    try:
+        while True:
+            done, _ = await asyncio.wait(
+                getters,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for getter in done:
+                topic = getters.pop(getter)
+                getters[asyncio.ensure_future(queues[topic].get())] = topic
+
+                event, last_event_id = getter.result(), last_event_ids.get(topic)
+                if last_event_id is not None and event.get("id") == last_event_id:
+                    # subscriber is already up to date with this version
+                    continue
+                yield topic, event
+    finally:
+        for getter in getters:
+            getter.cancel()
+        for topic, queue in queues.items():
+            broadcasters[topic].unsubscribe(queue)